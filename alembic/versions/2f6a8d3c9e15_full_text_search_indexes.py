@@ -0,0 +1,38 @@
+"""full_text_search_indexes
+
+Revision ID: 2f6a8d3c9e15
+Revises: 7c1d9a0e4b62
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2f6a8d3c9e15'
+down_revision: Union[str, Sequence[str], None] = '7c1d9a0e4b62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Выражения должны в точности совпадать с app/search.py, иначе планировщик не возьмет индекс
+SEARCH_INDEXES = {
+    'ix_disciplines_search': ('disciplines', """to_tsvector('russian', coalesce("name", ''))"""),
+    'ix_teachers_search': ('teachers', """to_tsvector('russian', coalesce("fio", '') || ' ' || coalesce("post", ''))"""),
+    'ix_subjects_search': ('subjects', """to_tsvector('russian', coalesce("name", '') || ' ' || coalesce("description", ''))"""),
+    'ix_achievements_search': ('achievements', """to_tsvector('russian', coalesce("title", '') || ' ' || coalesce("description", ''))"""),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, (table, expression) in SEARCH_INDEXES.items():
+        op.create_index(name, table, [sa.text(expression)], postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, (table, _) in SEARCH_INDEXES.items():
+        op.drop_index(name, table_name=table)
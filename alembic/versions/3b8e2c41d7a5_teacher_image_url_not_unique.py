@@ -0,0 +1,29 @@
+"""teacher_image_url_not_unique
+
+Revision ID: 3b8e2c41d7a5
+Revises: fc9d144e2075
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b8e2c41d7a5'
+down_revision: Union[str, Sequence[str], None] = 'fc9d144e2075'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Файлы адресуются по содержимому: одно фото у двух преподавателей — один URL
+    op.drop_constraint('teachers_image_url_key', 'teachers', type_='unique')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_unique_constraint('teachers_image_url_key', 'teachers', ['image_url'])
@@ -0,0 +1,28 @@
+"""teachers_subjects_gin_index
+
+Revision ID: 5e0b7f2a91c4
+Revises: 2f6a8d3c9e15
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e0b7f2a91c4'
+down_revision: Union[str, Sequence[str], None] = '2f6a8d3c9e15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_teachers_subjects', 'teachers', ['subjects'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_teachers_subjects', table_name='teachers', postgresql_using='gin')
@@ -0,0 +1,41 @@
+"""cms_unique_and_check_constraints
+
+Revision ID: 7c1d9a0e4b62
+Revises: 3b8e2c41d7a5
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1d9a0e4b62'
+down_revision: Union[str, Sequence[str], None] = '3b8e2c41d7a5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Проверки, которые раньше делались отдельными SELECT в ручках CMS.
+    # Если в таблицах уже есть дубли, миграция упадет — их нужно убрать вручную
+    # title уже проиндексирован (ix_*_title) — индекс становится уникальным, как в моделях
+    op.drop_index(op.f('ix_features_title'), table_name='features')
+    op.create_index(op.f('ix_features_title'), 'features', ['title'], unique=True)
+    op.drop_index(op.f('ix_achievements_title'), table_name='achievements')
+    op.create_index(op.f('ix_achievements_title'), 'achievements', ['title'], unique=True)
+    op.create_unique_constraint('disciplines_direction_id_name_key', 'disciplines', ['direction_id', 'name'])
+    op.create_check_constraint('ck_disciplines_terms', 'disciplines', 'start_term <= end_term')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('ck_disciplines_terms', 'disciplines', type_='check')
+    op.drop_constraint('disciplines_direction_id_name_key', 'disciplines', type_='unique')
+    op.drop_index(op.f('ix_achievements_title'), table_name='achievements')
+    op.create_index(op.f('ix_achievements_title'), 'achievements', ['title'], unique=False)
+    op.drop_index(op.f('ix_features_title'), table_name='features')
+    op.create_index(op.f('ix_features_title'), 'features', ['title'], unique=False)
@@ -0,0 +1,37 @@
+"""discipline_terms_range
+
+Revision ID: a4c3e8f1b2d7
+Revises: 5e0b7f2a91c4
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c3e8f1b2d7'
+down_revision: Union[str, Sequence[str], None] = '5e0b7f2a91c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # btree_gist — чтобы в одном GiST-индексе были и direction_id (=), и диапазон (@>, &&)
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+    op.add_column('disciplines', sa.Column(
+        'terms',
+        postgresql.INT4RANGE(),
+        sa.Computed("int4range(start_term, end_term, '[]')", persisted=True),
+    ))
+    op.create_index('ix_disciplines_direction_id_terms', 'disciplines', ['direction_id', 'terms'], postgresql_using='gist')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_disciplines_direction_id_terms', table_name='disciplines', postgresql_using='gist')
+    op.drop_column('disciplines', 'terms')
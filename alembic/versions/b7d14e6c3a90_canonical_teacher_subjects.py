@@ -0,0 +1,44 @@
+"""canonical_teacher_subjects
+
+Revision ID: b7d14e6c3a90
+Revises: a4c3e8f1b2d7
+Create Date: 2026-10-17 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d14e6c3a90'
+down_revision: Union[str, Sequence[str], None] = 'a4c3e8f1b2d7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Предметы, записанные до приведения к справочнику: то же, что делает
+    # cms_entities.canonical_subjects — написание из subjects, без пробелов по краям,
+    # без пустых и повторов, порядок сохраняется
+    op.execute("""
+        UPDATE teachers t
+        SET subjects = COALESCE((
+            SELECT array_agg(name ORDER BY position)
+            FROM (
+                SELECT COALESCE(s.name, btrim(u.name)) AS name, min(u.position) AS position
+                FROM unnest(t.subjects) WITH ORDINALITY AS u(name, position)
+                LEFT JOIN subjects s ON lower(s.name) = lower(btrim(u.name))
+                WHERE btrim(u.name) <> ''
+                GROUP BY 1
+            ) canonical
+        ), '{}')
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Исходное написание не сохраняется
+    pass
@@ -0,0 +1,43 @@
+"""discipline_terms_case
+
+Revision ID: c2e9f7a1d5b3
+Revises: b7d14e6c3a90
+Create Date: 2026-10-17 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2e9f7a1d5b3'
+down_revision: Union[str, Sequence[str], None] = 'b7d14e6c3a90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _replace_terms(expression: str) -> None:
+    # Выражение вычисляемой колонки до Postgres 17 не меняется — пересоздаем колонку и индекс
+    op.drop_index('ix_disciplines_direction_id_terms', table_name='disciplines', postgresql_using='gist')
+    op.drop_column('disciplines', 'terms')
+    op.add_column('disciplines', sa.Column(
+        'terms',
+        postgresql.INT4RANGE(),
+        sa.Computed(expression, persisted=True),
+    ))
+    op.create_index('ix_disciplines_direction_id_terms', 'disciplines', ['direction_id', 'terms'], postgresql_using='gist')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # int4range(4, 2) — ошибка 22000 еще до проверки ck_disciplines_terms;
+    # с CASE неверные семестры отсекает CHECK, и CMS отвечает 400, а не 500
+    _replace_terms("CASE WHEN start_term <= end_term THEN int4range(start_term, end_term, '[]') END")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _replace_terms("int4range(start_term, end_term, '[]')")
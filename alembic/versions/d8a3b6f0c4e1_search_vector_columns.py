@@ -0,0 +1,49 @@
+"""search_vector_columns
+
+Revision ID: d8a3b6f0c4e1
+Revises: c2e9f7a1d5b3
+Create Date: 2026-10-17 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8a3b6f0c4e1'
+down_revision: Union[str, Sequence[str], None] = 'c2e9f7a1d5b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Выражения — как у колонок search_vector в моделях и у индексов из 2f6a8d3c9e15
+SEARCH_VECTORS = {
+    'disciplines': """to_tsvector('russian', coalesce(name, ''))""",
+    'teachers': """to_tsvector('russian', coalesce(fio, '') || ' ' || coalesce(post, ''))""",
+    'subjects': """to_tsvector('russian', coalesce(name, '') || ' ' || coalesce(description, ''))""",
+    'achievements': """to_tsvector('russian', coalesce(title, '') || ' ' || coalesce(description, ''))""",
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Индекс по выражению находит строки, но ts_rank все равно считает to_tsvector
+    # заново для каждой из них; хранимая колонка считается один раз при записи
+    for table, expression in SEARCH_VECTORS.items():
+        op.drop_index(f'ix_{table}_search', table_name=table)
+        op.add_column(table, sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(expression, persisted=True),
+        ))
+        op.create_index(f'ix_{table}_search', table, ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, expression in SEARCH_VECTORS.items():
+        op.drop_index(f'ix_{table}_search', table_name=table, postgresql_using='gin')
+        op.drop_column(table, 'search_vector')
+        op.create_index(f'ix_{table}_search', table, [sa.text(expression)], postgresql_using='gin')
@@ -1,18 +1,21 @@
 import os
+from contextvars import ContextVar
 from typing import Any
 
-import shutil
-import uuid
-from pathlib import Path
 from fastapi import Request, UploadFile
 from sqladmin import Admin, ModelView
 from sqladmin.authentication import AuthenticationBackend
 from sqlalchemy import select
 from wtforms import PasswordField, TextAreaField, StringField, FileField
 
-from app.database import engine
+from app.database import engine, AsyncSessionLocal, read_session
 from app.models import User, Speciality, Feature, Direction, Discipline, Teacher, Subject, Achievement
-from app.security import verify_password, get_password_hash
+from app.security import password_hasher, PasswordServiceBusy
+from app.ratelimit import check_login_rate, too_many_requests
+from app.uploads import save_image
+from app.images import media_variant_url
+from app.assets import asset_url
+from app.cms_entities import canonical_subjects
 from starlette.datastructures import UploadFile
 
 # --- AUTHENTICATION ---
@@ -20,13 +23,19 @@ class AdminAuth(AuthenticationBackend):
     async def login(self, request: Request) -> bool:
         form = await request.form()
         email, password = form.get("username"), form.get("password")
+        check_login_rate(request, email)
 
         async with engine.connect() as conn:
             stmt = select(User).where(User.email == email)
             result = await conn.execute(stmt)
             user = result.fetchone()
 
-        if user and verify_password(password, user.hashed_password):
+        try:
+            password_ok = user is not None and await password_hasher.verify(password, user.hashed_password)
+        except PasswordServiceBusy:
+            raise too_many_requests()
+
+        if password_ok:
             request.session.update({"token": str(user.id)})
             return True
         return False
@@ -40,9 +49,35 @@ class AdminAuth(AuthenticationBackend):
 
 authentication_backend = AdminAuth(secret_key=os.getenv("SECRET_KEY", "supersecret"))
 
+# --- READ REPLICA ---
+
+_list_on_replica = ContextVar("admin_list_on_replica", default=False)
+
+class ReplicaListMixin:
+    """
+    Списки в админке (только чтение) читаются через read_session — с реплики,
+    а сразу после сохранения — с основной базы. Формы и сохранение остаются на основной.
+    """
+    async def list(self, request: Request):
+        token = _list_on_replica.set(True)
+        try:
+            return await super().list(request)
+        finally:
+            _list_on_replica.reset(token)
+
+    # У sqladmin нет публичной точки, через которую list() выполняет запрос, поэтому
+    # переопределяется приватный ModelView._run_query. Версия sqladmin закреплена
+    # в requirements.txt; при обновлении проверить, что list() по-прежнему его вызывает
+    async def _run_query(self, stmt):
+        if not _list_on_replica.get():
+            return await super()._run_query(stmt)
+        async with read_session() as session:
+            result = await session.execute(stmt)
+            return result.scalars().unique().all()
+
 # --- VIEWS ---
 
-class UserAdmin(ModelView, model=User):
+class UserAdmin(ReplicaListMixin, ModelView, model=User):
     name = "Администратор"
     name_plural = "Администраторы"
     icon = "fa-solid fa-user-shield"
@@ -62,11 +97,15 @@ class UserAdmin(ModelView, model=User):
     async def on_model_change(self, data: dict, model: Any, is_created: bool, request: Request) -> None:
         password = data.get("hashed_password")
         if password:
-            data["hashed_password"] = get_password_hash(password)
+            try:
+                data["hashed_password"] = await password_hasher.hash(password)
+            except PasswordServiceBusy:
+                # Как при входе: пул bcrypt занят — «попробуйте позже», а не 500
+                raise too_many_requests()
         elif not is_created and "hashed_password" in data:
             del data["hashed_password"]
 
-class SpecialityAdmin(ModelView, model=Speciality):
+class SpecialityAdmin(ReplicaListMixin, ModelView, model=Speciality):
     name = "Специальность"
     name_plural = "Специальности"
     icon = "fa-solid fa-graduation-cap"
@@ -82,7 +121,7 @@ class SpecialityAdmin(ModelView, model=Speciality):
     form_columns = [Speciality.name, Speciality.qualification, Speciality.term, Speciality.direction, Speciality.description]
     form_overrides = {"description": TextAreaField}
 
-class FeatureAdmin(ModelView, model=Feature):
+class FeatureAdmin(ReplicaListMixin, ModelView, model=Feature):
     name = "Преимущество"
     name_plural = "Преимущества"
     icon = "fa-solid fa-star"
@@ -98,7 +137,7 @@ class FeatureAdmin(ModelView, model=Feature):
         "svg_code": {"label": "Класс иконки FontAwesome (например: fa-solid fa-code)"}
     }
 
-class TeacherAdmin(ModelView, model=Teacher):
+class TeacherAdmin(ReplicaListMixin, ModelView, model=Teacher):
     name = "Преподаватель"
     name_plural = "Преподаватели"
     icon = "fa-solid fa-chalkboard-user"
@@ -113,6 +152,8 @@ class TeacherAdmin(ModelView, model=Teacher):
         Teacher.post: "Должность",
         Teacher.subjects: "Предметы"
     }
+    # Вычисляемая колонка поиска (отложенная): не показываем и не загружаем
+    column_details_exclude_list = [Teacher.search_vector]
 
     form_overrides = {
         "subjects": TextAreaField,
@@ -131,20 +172,13 @@ class TeacherAdmin(ModelView, model=Teacher):
     }
 
     column_formatters = {
-        Teacher.image_url: lambda m, a: f'<img src="{m.image_url}" width="50" style="border-radius: 5px; object-fit: cover;">' if m.image_url else "Нет фото"
+        Teacher.image_url: lambda m, a: f'<img src="{media_variant_url(m.image_url, 100, 100)}" width="50" style="border-radius: 5px; object-fit: cover;">' if m.image_url else "Нет фото"
     }
 
     async def on_model_change(self, data: dict, model: Any, is_created: bool, request: Request) -> None:
         input_file = data.get("image_url")
         if input_file and hasattr(input_file, "filename") and input_file.filename:
-            extension = input_file.filename.split(".")[-1]
-            unique_filename = f"{uuid.uuid4()}.{extension}"
-            save_directory = Path("app/uploads")
-            save_directory.mkdir(parents=True, exist_ok=True)
-            save_path = save_directory / unique_filename
-            with open(save_path, "wb") as buffer:
-                shutil.copyfileobj(input_file.file, buffer)
-            data["image_url"] = f"/media/{unique_filename}"
+            data["image_url"] = await save_image(input_file)
         else:
             if is_created:
                 data["image_url"] = ""
@@ -155,8 +189,11 @@ class TeacherAdmin(ModelView, model=Teacher):
         if isinstance(subjects_input, str):
             clean_text = subjects_input.replace("[", "").replace("]", "").replace("'", "").replace('"', "")
             data["subjects"] = [s.strip() for s in clean_text.split(",") if s.strip()]
+            # Как в CMS API: написание из справочника предметов, чтение с основной базы
+            async with AsyncSessionLocal() as session:
+                await canonical_subjects(session, [data])
 
-class DisciplineInline(ModelView, model=Discipline):
+class DisciplineInline(ReplicaListMixin, ModelView, model=Discipline):
     column_list = [Discipline.name, Discipline.group, Discipline.start_term, Discipline.end_term]
 
     form_columns = [
@@ -173,7 +210,7 @@ class DisciplineInline(ModelView, model=Discipline):
         Discipline.end_term: "По семестр"
     }
 
-class DisciplineAdmin(ModelView, model=Discipline):
+class DisciplineAdmin(ReplicaListMixin, ModelView, model=Discipline):
     name = "Дисциплина"
     name_plural = "Все дисциплины"
     icon = "fa-solid fa-book"
@@ -204,9 +241,10 @@ class DisciplineAdmin(ModelView, model=Discipline):
     ]
 
     column_searchable_list = [Discipline.name, Discipline.group]
+    column_details_exclude_list = [Discipline.search_vector]
     column_sortable_list = [Discipline.name, Discipline.start_term, Discipline.direction_id]
 
-class DirectionAdmin(ModelView, model=Direction):
+class DirectionAdmin(ReplicaListMixin, ModelView, model=Direction):
     name = "Направление (План)"
     name_plural = "Направления (План)"
     icon = "fa-solid fa-route"
@@ -216,24 +254,28 @@ class DirectionAdmin(ModelView, model=Direction):
 
     inline_models = [DisciplineInline]
 
-class SubjectAdmin(ModelView, model=Subject):
+class SubjectAdmin(ReplicaListMixin, ModelView, model=Subject):
     name = "Технология (Стек)"
     name_plural = "Технологии (Стек)"
     icon = "fa-solid fa-layer-group"
     
     column_list = [Subject.name, Subject.svg_code]
     column_labels = {Subject.name: "Название", Subject.description: "Описание", Subject.svg_code: "Иконка"}
+    column_details_exclude_list = [Subject.search_vector]
+    form_excluded_columns = [Subject.search_vector]
     form_args = {
         "svg_code": {"label": "Класс иконки FontAwesome (например: fa-brands fa-python)"}
     }
 
-class AchievementAdmin(ModelView, model=Achievement):
+class AchievementAdmin(ReplicaListMixin, ModelView, model=Achievement):
     name = "Достижение"
     name_plural = "Достижения"
     icon = "fa-solid fa-trophy"
     
     column_list = [Achievement.theme, Achievement.title]
     column_labels = {Achievement.theme: "Тема (тег)", Achievement.title: "Заголовок", Achievement.description: "Описание"}
+    column_details_exclude_list = [Achievement.search_vector]
+    form_excluded_columns = [Achievement.search_vector]
     form_overrides = {"description": TextAreaField}
 
 
@@ -249,6 +291,7 @@ def setup_admin(app):
         logo_url=None,
         templates_dir="app/templates"
     )
+    admin.templates.env.globals["asset_url"] = asset_url
     
     admin.add_view(UserAdmin)
     admin.add_view(SpecialityAdmin)
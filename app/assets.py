@@ -0,0 +1,104 @@
+import hashlib
+import os
+from typing import Dict, Optional
+
+import orjson
+
+SOURCE_DIR = "app/static"
+DIST_DIR = "app/dist"
+MANIFEST_PATH = os.path.join(DIST_DIR, "manifest.json")
+URL_PREFIX = "/assets"
+
+# Что раздается с отпечатком. robots.txt, sitemap.xml и т.п. должны жить по постоянным адресам
+FINGERPRINT_SUFFIXES = {".css", ".js", ".svg", ".png", ".jpg", ".webp", ".ico", ".woff2"}
+HASH_LENGTH = 10
+
+_manifest: Optional[Dict[str, str]] = None
+
+
+def fingerprint_name(relative_path: str, data: bytes) -> str:
+    """
+    styles.css -> styles.<hash>.css
+    """
+    stem, suffix = os.path.splitext(relative_path)
+    digest = hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+    return f"{stem}.{digest}{suffix}"
+
+
+def build_assets(source_dir: str = SOURCE_DIR, dist_dir: str = DIST_DIR) -> Dict[str, str]:
+    """
+    Копирует файлы из source_dir в dist_dir под именами с хэшем содержимого
+    и пишет manifest.json (исходное имя -> имя с хэшем). Устаревшие копии удаляет.
+    """
+    manifest = {}
+    for root, _, files in os.walk(source_dir):
+        for filename in files:
+            if os.path.splitext(filename)[1] not in FINGERPRINT_SUFFIXES:
+                continue
+            path = os.path.join(root, filename)
+            relative_path = os.path.relpath(path, source_dir).replace(os.sep, "/")
+            with open(path, "rb") as source:
+                data = source.read()
+            hashed = fingerprint_name(relative_path, data)
+            manifest[relative_path] = hashed
+
+            target = os.path.join(dist_dir, hashed)
+            if os.path.exists(target):
+                continue
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            tmp_path = target + ".tmp"
+            with open(tmp_path, "wb") as output:
+                output.write(data)
+            os.replace(tmp_path, target)
+
+    keep = set(manifest.values())
+    for root, _, files in os.walk(dist_dir):
+        for filename in files:
+            path = os.path.join(root, filename)
+            relative_path = os.path.relpath(path, dist_dir).replace(os.sep, "/")
+            base = relative_path
+            for suffix in (".br", ".gz"):
+                if base.endswith(suffix):
+                    base = base[:-len(suffix)]
+            if base not in keep and relative_path != "manifest.json":
+                os.unlink(path)
+
+    os.makedirs(dist_dir, exist_ok=True)
+    manifest_path = os.path.join(dist_dir, "manifest.json")
+    with open(manifest_path + ".tmp", "wb") as output:
+        output.write(orjson.dumps(manifest, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS))
+    os.replace(manifest_path + ".tmp", manifest_path)
+    return manifest
+
+
+def _load_manifest() -> Dict[str, str]:
+    global _manifest
+    if _manifest is None:
+        try:
+            with open(MANIFEST_PATH, "rb") as source:
+                _manifest = orjson.loads(source.read())
+        except FileNotFoundError:
+            _manifest = {}
+    return _manifest
+
+
+def asset_url(name: str) -> str:
+    """
+    URL файла из app/static: с отпечатком, если он есть в манифесте, иначе обычный /static/.
+    """
+    hashed = _load_manifest().get(name)
+    if hashed is None:
+        return f"/static/{name}"
+    return f"{URL_PREFIX}/{hashed}"
+
+
+def refresh_assets() -> None:
+    """
+    Пересобирает app/dist и подменяет манифест, которым пользуется asset_url.
+    """
+    global _manifest
+    _manifest = build_assets()
+
+
+if __name__ == "__main__":
+    print(f"{DIST_DIR}: файлов в манифесте — {len(build_assets())}")
@@ -0,0 +1,173 @@
+import asyncio
+from itertools import chain
+from typing import Any, Awaitable, Callable, Dict, Iterable, Tuple
+
+import orjson
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.compression import compress
+
+Loader = Callable[[Any], Awaitable[Iterable[Any]]]
+Builder = Callable[..., Any]
+
+
+class Snapshot:
+    """
+    Неизменяемый снимок одной коллекции (или производного представления).
+    JSON-тело сериализуется (и сжимается) один раз при первом обращении и дальше отдается как есть.
+    """
+    __slots__ = ("name", "version", "data", "_body", "_encoded")
+
+    def __init__(self, name: str, version: int, data: Any):
+        object.__setattr__(self, "name", name)
+        object.__setattr__(self, "version", version)
+        object.__setattr__(self, "data", data)
+        object.__setattr__(self, "_body", None)
+        object.__setattr__(self, "_encoded", {})
+
+    def __setattr__(self, key, value):
+        raise AttributeError("Snapshot неизменяем")
+
+    @property
+    def body(self) -> bytes:
+        if self._body is None:
+            # Готовые байты (например, отрендеренный HTML) отдаются без сериализации
+            body = self.data if isinstance(self.data, bytes) else orjson.dumps(self.data)
+            object.__setattr__(self, "_body", body)
+        return self._body
+
+    async def encoded(self, encoding: str) -> bytes:
+        task = self._encoded.get(encoding)
+        if task is None:
+            # brotli 11 на теле лендинга — заметное время CPU: сжимаем в пуле потоков,
+            # чтобы не держать цикл событий; одновременные запросы ждут одну задачу
+            task = asyncio.ensure_future(run_in_threadpool(compress, self.body, encoding))
+            self._encoded[encoding] = task
+        # shield: отключившийся клиент не должен отменить сжатие для остальных
+        return await asyncio.shield(task)
+
+
+class SnapshotCache:
+    """
+    Версионированный кэш коллекций в памяти процесса.
+
+    Каждый источник (source) загружается из БД при первом обращении и отдается
+    из памяти до тех пор, пока коммит не затронет одну из связанных с ним моделей.
+    Инвалидация точечная: меняется версия только затронутых источников.
+    Представления (view) собираются из снимков источников; их версия — сумма
+    версий зависимостей, поэтому она растет при любом изменении хотя бы одной из них.
+    Кэш живет в памяти одного процесса — при нескольких воркерах каждый держит свой.
+    """
+
+    def __init__(self, session_factory: Callable[[], Any]):
+        self._session_factory = session_factory
+        self._loaders: Dict[str, Loader] = {}
+        self._views: Dict[str, Tuple[Tuple[str, ...], Builder]] = {}
+        self._models: Dict[type, Tuple[str, ...]] = {}
+        self._versions: Dict[str, int] = {}
+        self._snapshots: Dict[str, Snapshot] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    def source(self, name: str, *models: type):
+        """
+        Регистрирует загрузчик коллекции и модели, изменение которых её инвалидирует.
+        """
+        def decorator(loader: Loader) -> Loader:
+            self._loaders[name] = loader
+            self._versions[name] = 0
+            self._locks[name] = asyncio.Lock()
+            for model in models:
+                self._models[model] = self._models.get(model, ()) + (name,)
+            return loader
+        return decorator
+
+    def view(self, name: str, *deps: str):
+        """
+        Регистрирует производное представление, собираемое из снимков deps.
+        Сборщик получает данные зависимостей именованными аргументами.
+        """
+        def decorator(builder: Builder) -> Builder:
+            self._views[name] = (deps, builder)
+            self._locks[name] = asyncio.Lock()
+            return builder
+        return decorator
+
+    def version(self, name: str) -> int:
+        if name in self._views:
+            deps, _ = self._views[name]
+            return sum(self.version(dep) for dep in deps)
+        return self._versions[name]
+
+    def invalidate(self, *names: str) -> None:
+        for name in names:
+            self._versions[name] += 1
+            self._snapshots.pop(name, None)
+
+    def invalidate_models(self, models: Iterable[type]) -> None:
+        names = set()
+        for model in models:
+            names.update(self._models.get(model, ()))
+        self.invalidate(*names)
+
+    async def get(self, name: str) -> Snapshot:
+        snapshot = self._snapshots.get(name)
+        if snapshot is not None and snapshot.version == self.version(name):
+            return snapshot
+
+        async with self._locks[name]:
+            # Пока ждали блокировку, снимок мог собрать другой запрос
+            snapshot = self._snapshots.get(name)
+            version = self.version(name)
+            if snapshot is not None and snapshot.version == version:
+                return snapshot
+
+            snapshot = Snapshot(name, version, await self._build(name))
+            # Если во время сборки пришла инвалидация, снимок не сохраняем
+            if version == self.version(name):
+                self._snapshots[name] = snapshot
+            return snapshot
+
+    async def _build(self, name: str) -> Any:
+        if name in self._views:
+            deps, builder = self._views[name]
+            snapshots = {dep: (await self.get(dep)).data for dep in deps}
+            return builder(**snapshots)
+
+        async with self._session_factory() as session:
+            data = await self._loaders[name](session)
+        # Готовый JSON-документ (bytes) отдается как есть, списки замораживаем
+        return data if isinstance(data, bytes) else tuple(data)
+
+    def bind_session_events(self) -> None:
+        """
+        Подписывает кэш на коммиты всех ORM-сессий (CMS, sqladmin и т.д.).
+        """
+        event.listen(Session, "after_flush", self._collect_flush)
+        event.listen(Session, "do_orm_execute", self._collect_statement)
+        event.listen(Session, "after_commit", self._on_commit)
+        event.listen(Session, "after_rollback", self._on_rollback)
+
+    @staticmethod
+    def _touched(session: Session) -> set:
+        return session.info.setdefault("cache_touched_models", set())
+
+    def _collect_flush(self, session: Session, flush_context) -> None:
+        touched = self._touched(session)
+        for obj in chain(session.new, session.dirty, session.deleted):
+            touched.add(type(obj))
+
+    def _collect_statement(self, orm_execute_state) -> None:
+        if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+            mapper = orm_execute_state.bind_mapper
+            if mapper is not None:
+                self._touched(orm_execute_state.session).add(mapper.class_)
+
+    def _on_commit(self, session: Session) -> None:
+        touched = session.info.pop("cache_touched_models", None)
+        if touched:
+            self.invalidate_models(touched)
+
+    def _on_rollback(self, session: Session) -> None:
+        session.info.pop("cache_touched_models", None)
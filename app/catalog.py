@@ -0,0 +1,215 @@
+from sqlalchemy import Text, cast, func, literal_column
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.future import select
+from sqlalchemy.orm import selectinload
+
+from app.cache import SnapshotCache
+from app.database import AsyncSessionLocal
+from app.templating import templates, json_script
+
+from app.models.speciality import Speciality
+from app.models.feature import Feature
+from app.models.plan import Direction, Discipline
+from app.models.teacher import Teacher
+from app.models.subject import Subject
+from app.models.achievement import Achievement
+
+from app.schemas.speciality import Speciality as SpecialitySchema
+from app.schemas.feature import Feature as FeatureSchema
+from app.schemas.teacher import Teacher as TeacherSchema
+from app.schemas.subject import Subject as SubjectSchema
+from app.schemas.achievement import Achievement as AchievementSchema
+
+# Снимки загружаются с основной базы, а не с реплики: перестройка идет сразу после
+# записи, и отставшая реплика закэшировала бы старые данные под новой версией (и ETag).
+# Загрузки редкие — только после инвалидации, — так что нагрузка на основную небольшая
+catalog = SnapshotCache(AsyncSessionLocal)
+catalog.bind_session_events()
+
+
+async def _load_list(session, model, schema, order_by):
+    result = await session.execute(select(model).order_by(order_by))
+    return [schema.model_validate(row).model_dump() for row in result.scalars().all()]
+
+
+@catalog.source("speciality", Speciality)
+async def load_speciality(session):
+    return await _load_list(session, Speciality, SpecialitySchema, Speciality.id)
+
+
+@catalog.source("subjects", Subject)
+async def load_subjects(session):
+    return await _load_list(session, Subject, SubjectSchema, Subject.id)
+
+
+@catalog.source("features", Feature)
+async def load_features(session):
+    return await _load_list(session, Feature, FeatureSchema, Feature.id)
+
+
+@catalog.source("teachers", Teacher)
+async def load_teachers(session):
+    return await _load_list(session, Teacher, TeacherSchema, Teacher.fio)
+
+
+@catalog.source("achievements", Achievement)
+async def load_achievements(session):
+    return await _load_list(session, Achievement, AchievementSchema, Achievement.id)
+
+
+@catalog.source("directions", Direction, Discipline)
+async def load_directions(session):
+    result = await session.execute(select(Direction).options(selectinload(Direction.disciplines)).order_by(Direction.id))
+    directions = result.scalars().all()
+
+    return [{
+        "id": d.id,
+        "name": d.name,
+        "disciplines": [{
+            "id": disc.id,
+            "name": disc.name,
+            "start_term": disc.start_term,
+            "end_term": disc.end_term,
+            "group": disc.group,
+            "direction_id": disc.direction_id
+        } for disc in d.disciplines]
+    } for d in directions]
+
+
+def directions_document_query():
+    """
+    Весь список направлений с дисциплинами одним SELECT: json_build_object/json_agg,
+    порядок задается в БД, результат — готовый текст JSON.
+    """
+    discipline = func.json_build_object(
+        "id", Discipline.id,
+        "name", Discipline.name,
+        "start_term", Discipline.start_term,
+        "end_term", Discipline.end_term,
+        "group", Discipline.group,
+        "direction_id", Discipline.direction_id,
+    )
+    empty = literal_column("'[]'::json")
+    disciplines = (
+        select(func.coalesce(func.json_agg(aggregate_order_by(discipline, Discipline.id)), empty))
+        .where(Discipline.direction_id == Direction.id)
+        .correlate(Direction)
+        .scalar_subquery()
+    )
+    direction = func.json_build_object("id", Direction.id, "name", Direction.name, "disciplines", disciplines)
+    document = func.coalesce(func.json_agg(aggregate_order_by(direction, Direction.id)), empty)
+    return select(cast(document, Text)).select_from(Direction)
+
+
+@catalog.source("directions_document", Direction, Discipline)
+async def load_directions_document(session):
+    result = await session.execute(directions_document_query())
+    return result.scalar_one().encode("utf-8")
+
+
+COMMON_GROUP = "Общие"
+
+
+def pack_lanes(disciplines):
+    """
+    Раскладывает дисциплины по строкам без пересечений по семестрам (жадно:
+    по началу, при равном начале — сначала длинные). У каждой дисциплины —
+    gap (пустых семестров перед ней в строке) и span (сколько семестров идет).
+    """
+    ordered = sorted(disciplines, key=lambda d: (d["start_term"], d["start_term"] - d["end_term"]))
+    lanes = []
+    for discipline in ordered:
+        for lane in lanes:
+            if discipline["start_term"] > lane[-1]["end_term"]:
+                lane.append(discipline)
+                break
+        else:
+            lanes.append([discipline])
+
+    packed = []
+    for lane in lanes:
+        current_term = 1
+        cells = []
+        for discipline in lane:
+            cells.append({
+                "id": discipline["id"],
+                "name": discipline["name"],
+                "start_term": discipline["start_term"],
+                "end_term": discipline["end_term"],
+                "gap": discipline["start_term"] - current_term,
+                "span": discipline["end_term"] - discipline["start_term"] + 1,
+            })
+            current_term = discipline["end_term"] + 1
+        packed.append(cells)
+    return packed
+
+
+@catalog.view("roadmap", "directions")
+def build_roadmap(directions):
+    """
+    Раскладка дорожной карты: направление -> группы («Общие» первой) -> строки -> дисциплины.
+    Считается один раз на версию данных, клиенту остается только отрисовать.
+    """
+    roadmap = []
+    for direction in directions:
+        groups = {}
+        for discipline in direction["disciplines"]:
+            groups.setdefault(discipline["group"] or COMMON_GROUP, []).append(discipline)
+        names = sorted(groups, key=lambda name: (name != COMMON_GROUP, name.casefold()))
+        roadmap.append({
+            "id": direction["id"],
+            "name": direction["name"],
+            "groups": [{"name": name, "lanes": pack_lanes(groups[name])} for name in names],
+        })
+    return roadmap
+
+
+def subject_key(name: str) -> str:
+    # Предметы у преподавателя — свободный текст, сравниваем без учета регистра и пробелов по краям
+    return name.strip().casefold()
+
+
+@catalog.view("subject_teachers", "subjects", "teachers")
+def build_subject_teachers(subjects, teachers):
+    """
+    Обратный индекс: id предмета -> id преподавателей, у которых он указан.
+    """
+    teacher_ids = {}
+    for teacher in teachers:
+        for name in teacher["subjects"]:
+            teacher_ids.setdefault(subject_key(name), []).append(teacher["id"])
+    return {
+        str(subject["id"]): teacher_ids.get(subject_key(subject["name"]), [])
+        for subject in subjects
+    }
+
+
+@catalog.view("teachers_by_subject", "subject_teachers", "teachers")
+def build_teachers_by_subject(subject_teachers, teachers):
+    by_id = {teacher["id"]: teacher for teacher in teachers}
+    return {
+        subject_id: [by_id[teacher_id] for teacher_id in teacher_ids]
+        for subject_id, teacher_ids in subject_teachers.items()
+    }
+
+
+@catalog.view("landing", "speciality", "subjects", "features", "teachers", "achievements", "roadmap", "subject_teachers")
+def build_landing(speciality, subjects, features, teachers, achievements, roadmap, subject_teachers):
+    return {
+        "specialities": speciality,
+        "subjects": subjects,
+        "features": features,
+        "teachers": teachers,
+        "achievements": achievements,
+        "roadmap": roadmap,
+        "subject_teachers": subject_teachers,
+    }
+
+
+@catalog.view("page", "landing")
+def build_page(landing):
+    """
+    Главная страница с данными лендинга, встроенными JSON-островом.
+    """
+    html = templates.get_template("index.html").render(landing_json=json_script(landing))
+    return html.encode("utf-8")
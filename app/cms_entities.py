@@ -0,0 +1,384 @@
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import delete, insert, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.speciality import Speciality
+from app.models.feature import Feature
+from app.models.plan import Direction, Discipline
+from app.models.teacher import Teacher
+from app.models.subject import Subject
+from app.models.achievement import Achievement
+
+from app.schemas.speciality import SpecialityCreate, SpecialityUpdate
+from app.schemas.feature import FeatureCreate, FeatureUpdate
+from app.schemas.plan import DirectionCreate, DirectionUpdate, DisciplineCreate, DisciplineUpdate
+from app.schemas.teacher import TeacherCreate, TeacherUpdate
+from app.schemas.subject import SubjectCreate, SubjectUpdate
+from app.schemas.achievement import AchievementCreate, AchievementUpdate
+from app.schemas.batch import BatchOperation, BatchItemResult, BatchResult
+from app.catalog import subject_key
+
+
+class CmsEntity:
+    """
+    Описание раздела CMS: модель, схемы создания/обновления и поля,
+    которые вместе должны быть уникальны.
+    """
+
+    def __init__(
+        self,
+        model,
+        create_schema: Type[BaseModel],
+        update_schema: Type[BaseModel],
+        unique: Tuple[str, ...],
+        duplicate_detail: str,
+        not_found_detail: str,
+    ):
+        self.model = model
+        self.create_schema = create_schema
+        self.update_schema = update_schema
+        self.unique = unique
+        self.duplicate_detail = duplicate_detail
+        self.not_found_detail = not_found_detail
+
+    def unique_key(self, values: Dict[str, Any]) -> Tuple:
+        return tuple(values.get(field) for field in self.unique)
+
+    def check(self, values: Dict[str, Any]) -> Optional[str]:
+        """
+        Проверки, которые не выразить схемой (зависят от нескольких полей).
+        """
+        if self.model is Discipline and values["start_term"] > values["end_term"]:
+            return "Начальный семестр не может быть больше конечного"
+        return None
+
+    @property
+    def columns(self):
+        # Вычисляемые колонки (disciplines.terms) не пишутся и не отдаются клиенту
+        return [column for column in self.model.__table__.columns if column.computed is None]
+
+
+# Ошибки ограничений, у которых есть понятное пользователю сообщение
+CONSTRAINT_DETAILS = {
+    "ck_disciplines_terms": "Начальный семестр не может быть больше конечного",
+    "disciplines_direction_id_fkey": "Указанное направление не существует",
+    "ix_features_title": "Объект с таким названием уже существует",
+    "ix_achievements_title": "Достижение с таким названием уже существует",
+}
+
+UNIQUE_VIOLATION = "23505"
+
+
+# Ключи совпадают с путями одиночных ручек (/subject, /directions, ...)
+ENTITIES: Dict[str, CmsEntity] = {
+    "subject": CmsEntity(
+        Subject, SubjectCreate, SubjectUpdate, ("name",),
+        "Предмет с таким названием уже существует", "Предмет не найден",
+    ),
+    "feature": CmsEntity(
+        Feature, FeatureCreate, FeatureUpdate, ("title",),
+        "Объект с таким названием уже существует", "Объект не найден",
+    ),
+    "speciality": CmsEntity(
+        Speciality, SpecialityCreate, SpecialityUpdate, ("name",),
+        "Специальность с таким названием уже существует", "Специальность не найдена",
+    ),
+    "achievements": CmsEntity(
+        Achievement, AchievementCreate, AchievementUpdate, ("title",),
+        "Достижение с таким названием уже существует", "Достижение не найдено",
+    ),
+    "directions": CmsEntity(
+        Direction, DirectionCreate, DirectionUpdate, ("name",),
+        "Направление с таким названием уже существует", "Направление не найдено",
+    ),
+    "disciplines": CmsEntity(
+        Discipline, DisciplineCreate, DisciplineUpdate, ("direction_id", "name"),
+        "Дисциплина с таким названием уже есть в направлении", "Дисциплина не найдена",
+    ),
+    "teacher": CmsEntity(
+        Teacher, TeacherCreate, TeacherUpdate, ("fio",),
+        "Преподаватель с таким ФИО уже существует", "Преподаватель не найден",
+    ),
+}
+
+
+async def canonical_subjects(db: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+    """
+    Приводит предметы преподавателей к написанию из справочника (на месте, один SELECT).
+    Фильтр /teachers?subject= сравнивает точно, поэтому все пути записи идут через эту функцию.
+    Читается сессия записи — основная база, а не реплика.
+    """
+    rows = [values for values in rows if values.get("subjects")]
+    if not rows:
+        return
+    result = await db.execute(select(Subject.name))
+    canonical = {subject_key(name): name for name in result.scalars()}
+    for values in rows:
+        names = []
+        for name in values["subjects"]:
+            name = canonical.get(subject_key(name), name.strip())
+            if name and name not in names:
+                names.append(name)
+        values["subjects"] = names
+
+
+async def _prepare(db: AsyncSession, entity: CmsEntity, rows: List[Dict[str, Any]]) -> None:
+    if entity.model is Teacher:
+        await canonical_subjects(db, rows)
+
+
+def _validation_message(error: ValidationError) -> str:
+    first = error.errors()[0]
+    location = ".".join(str(part) for part in first["loc"])
+    return f"{location}: {first['msg']}" if location else first["msg"]
+
+
+def integrity_detail(error: IntegrityError, duplicate_detail: str, error_detail: str) -> str:
+    """
+    Сообщение для IntegrityError: по имени ограничения, для нарушения уникальности — duplicate_detail.
+    """
+    orig = getattr(error, "orig", None)
+    constraint = getattr(getattr(orig, "__cause__", None), "constraint_name", None)
+    if constraint in CONSTRAINT_DETAILS:
+        return CONSTRAINT_DETAILS[constraint]
+    if getattr(orig, "sqlstate", None) == UNIQUE_VIOLATION:
+        return duplicate_detail
+    return error_detail
+
+
+async def _write(db: AsyncSession, statement, duplicate_detail: str, error_detail: str) -> Optional[Dict[str, Any]]:
+    try:
+        result = await db.execute(statement)
+        row = result.mappings().one_or_none()
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=integrity_detail(e, duplicate_detail, error_detail)
+        )
+    return dict(row) if row is not None else None
+
+
+async def create_row(
+    db: AsyncSession,
+    entity: CmsEntity,
+    values: Dict[str, Any],
+    duplicate_detail: str,
+    error_detail: str,
+) -> Dict[str, Any]:
+    """
+    INSERT ... ON CONFLICT DO NOTHING RETURNING: пустой ответ значит, что ключ занят.
+    Уникальность, внешние ключи и CHECK проверяет база, отдельные SELECT не нужны.
+    """
+    model = entity.model
+    await _prepare(db, entity, [values])
+    statement = (
+        pg_insert(model)
+        .values(**values)
+        .on_conflict_do_nothing(index_elements=[getattr(model, field) for field in entity.unique])
+        .returning(*entity.columns)
+    )
+    row = await _write(db, statement, duplicate_detail, error_detail)
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=duplicate_detail
+        )
+    return row
+
+
+async def update_row(
+    db: AsyncSession,
+    entity: CmsEntity,
+    row_id: int,
+    values: Dict[str, Any],
+    duplicate_detail: str,
+    error_detail: str,
+) -> Dict[str, Any]:
+    """
+    UPDATE ... WHERE id = ... RETURNING: нет строки в ответе — 404.
+    """
+    model = entity.model
+    await _prepare(db, entity, [values])
+    statement = update(model).where(model.id == row_id).returning(*entity.columns)
+    if values:
+        statement = statement.values(**values)
+    else:
+        # Пустое обновление: просто вернуть строку
+        statement = select(*entity.columns).where(model.id == row_id)
+    row = await _write(db, statement, duplicate_detail, error_detail)
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=entity.not_found_detail
+        )
+    return row
+
+
+async def delete_row(
+    db: AsyncSession,
+    entity: CmsEntity,
+    row_id: int,
+    error_detail: str,
+    *extra_returning,
+) -> Dict[str, Any]:
+    """
+    DELETE ... WHERE id = ... RETURNING: нет строки в ответе — 404.
+    """
+    model = entity.model
+    statement = delete(model).where(model.id == row_id).returning(*entity.columns, *extra_returning)
+    row = await _write(db, statement, error_detail, error_detail)
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=entity.not_found_detail
+        )
+    return row
+
+
+async def run_batch(db: AsyncSession, entity: CmsEntity, operations: List[BatchOperation]) -> BatchResult:
+    """
+    Проверяет все операции и, если ошибок нет, выполняет их в одной транзакции:
+    удаления одним DELETE ... IN, обновления одним UPDATE по первичному ключу
+    (executemany), создания одним многострочным INSERT ... RETURNING.
+    При любой ошибке ничего не записывается.
+
+    Число запросов к БД не зависит от числа операций.
+    """
+    model = entity.model
+    results = [BatchItemResult(index=i, op=operation.op, id=operation.id) for i, operation in enumerate(operations)]
+    values: List[Optional[Dict[str, Any]]] = [None] * len(operations)
+    changes: Dict[int, Dict[str, Any]] = {}
+
+    # 1. Схемы и обязательный id
+    for i, operation in enumerate(operations):
+        if operation.op == "create":
+            if operation.id is not None:
+                results[i].error = "id задается базой данных"
+                continue
+            schema = entity.create_schema
+        else:
+            if operation.id is None:
+                results[i].error = "Не указан id"
+                continue
+            schema = entity.update_schema
+        if operation.op == "delete":
+            values[i] = {}
+            continue
+        try:
+            values[i] = schema.model_validate(operation.data or {}).model_dump(exclude_unset=operation.op == "update")
+            if operation.op == "update":
+                changes[i] = values[i]
+        except ValidationError as e:
+            results[i].error = _validation_message(e)
+
+    await _prepare(db, entity, [
+        values[i] for i, operation in enumerate(operations)
+        if not results[i].error and operation.op != "delete"
+    ])
+
+    # 2. Текущие строки для update/delete — один SELECT
+    ids = {operation.id for operation in operations if operation.op != "create" and operation.id is not None}
+    existing: Dict[int, Dict[str, Any]] = {}
+    if ids:
+        rows = await db.execute(select(*entity.columns).where(model.id.in_(ids)))
+        existing = {row["id"]: dict(row) for row in rows.mappings()}
+
+    touched_ids = set()
+    for i, operation in enumerate(operations):
+        if results[i].error or operation.op == "create":
+            continue
+        if operation.id not in existing:
+            results[i].error = entity.not_found_detail
+        elif operation.id in touched_ids:
+            results[i].error = "Строка уже изменяется в этом пакете"
+        else:
+            touched_ids.add(operation.id)
+            if operation.op == "update":
+                values[i] = {**existing[operation.id], **values[i]}
+
+    for i, operation in enumerate(operations):
+        if not results[i].error and operation.op != "delete":
+            results[i].error = entity.check(values[i])
+
+    # 3. Уникальность: внутри пакета и против БД — один SELECT
+    freed = set()
+    for i, operation in enumerate(operations):
+        if results[i].error or operation.op == "create":
+            continue
+        old_key = entity.unique_key(existing[operation.id])
+        if operation.op == "delete" or entity.unique_key(values[i]) != old_key:
+            freed.add(old_key)
+
+    claimed: Dict[Tuple, int] = {}
+    for i, operation in enumerate(operations):
+        if results[i].error or operation.op == "delete":
+            continue
+        key = entity.unique_key(values[i])
+        if operation.op == "update" and key == entity.unique_key(existing[operation.id]):
+            continue
+        if key in claimed:
+            results[i].error = f"{entity.duplicate_detail} (операция {claimed[key]})"
+        else:
+            claimed[key] = i
+
+    if claimed:
+        columns = [getattr(model, field) for field in entity.unique]
+        condition = tuple_(*columns).in_(list(claimed)) if len(columns) > 1 else columns[0].in_([key[0] for key in claimed])
+        rows = await db.execute(select(*columns).where(condition))
+        taken = {tuple(row) for row in rows} - freed
+        for key, i in claimed.items():
+            if key in taken:
+                results[i].error = entity.duplicate_detail
+
+    # 4. Внешние ключи — один SELECT
+    if model is Discipline:
+        direction_ids = {
+            values[i]["direction_id"] for i, operation in enumerate(operations)
+            if not results[i].error and operation.op != "delete"
+        }
+        if direction_ids:
+            rows = await db.execute(select(Direction.id).where(Direction.id.in_(direction_ids)))
+            missing = direction_ids - set(rows.scalars())
+            for i, operation in enumerate(operations):
+                if not results[i].error and operation.op != "delete" and values[i]["direction_id"] in missing:
+                    results[i].error = "Указанное направление не существует"
+
+    if any(result.error for result in results):
+        await db.rollback()
+        return BatchResult(committed=False, results=results)
+
+    # 5. Запись. Сначала удаления и обновления — они освобождают уникальные значения
+    deletes = [operation.id for operation in operations if operation.op == "delete"]
+    updates = [
+        {**changes[i], "id": operation.id}
+        for i, operation in enumerate(operations) if operation.op == "update" and changes[i]
+    ]
+    creates = [i for i, operation in enumerate(operations) if operation.op == "create"]
+
+    try:
+        if deletes:
+            await db.execute(delete(model).where(model.id.in_(deletes)))
+        if updates:
+            await db.execute(update(model), updates)
+        if creates:
+            rows = await db.execute(
+                insert(model).returning(model.id, sort_by_parameter_order=True),
+                [values[i] for i in creates],
+            )
+            for i, new_id in zip(creates, rows.scalars()):
+                results[i].id = new_id
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        return BatchResult(committed=False, error="Пакет нарушает ограничения базы данных", results=results)
+
+    for result in results:
+        result.status = {"create": "created", "update": "updated", "delete": "deleted"}[result.op]
+    return BatchResult(committed=True, results=results)
@@ -0,0 +1,136 @@
+import gzip
+import mimetypes
+import os
+import sys
+from typing import Optional
+
+import brotli
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+
+# Файлы меньше этого размера сжимать не выгодно
+MIN_SIZE = 500
+
+COMPRESSIBLE_SUFFIXES = {".css", ".js", ".html", ".svg", ".txt", ".xml", ".json"}
+
+# В порядке предпочтения: brotli жмет текст заметно лучше gzip
+ENCODINGS = {
+    "br": ".br",
+    "gzip": ".gz",
+}
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=11)
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    raise ValueError(f"Неизвестное кодирование: {encoding}")
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Выбирает кодирование по заголовку Accept-Encoding (с учетом q=0).
+    """
+    if not accept_encoding:
+        return None
+
+    accepted = set()
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        params = params.replace(" ", "")
+        if params.startswith("q="):
+            try:
+                if float(params[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(token.strip().lower())
+
+    for encoding in ENCODINGS:
+        if encoding in accepted or "*" in accepted:
+            return encoding
+    return None
+
+
+def precompress_directory(directory: str) -> int:
+    """
+    Создает рядом с текстовыми файлами сжатые копии .br/.gz.
+    Пересжимает только то, что изменилось с прошлого раза. Возвращает число записанных файлов.
+    """
+    written = 0
+    for root, _, files in os.walk(directory):
+        for filename in files:
+            path = os.path.join(root, filename)
+            if os.path.splitext(filename)[1] not in COMPRESSIBLE_SUFFIXES:
+                continue
+            stat_result = os.stat(path)
+            if stat_result.st_size < MIN_SIZE:
+                continue
+
+            data = None
+            for encoding, suffix in ENCODINGS.items():
+                target = path + suffix
+                if os.path.exists(target) and os.stat(target).st_mtime >= stat_result.st_mtime:
+                    continue
+                if data is None:
+                    with open(path, "rb") as source:
+                        data = source.read()
+                tmp_path = target + ".tmp"
+                with open(tmp_path, "wb") as output:
+                    output.write(compress(data, encoding))
+                os.replace(tmp_path, target)
+                written += 1
+    return written
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles, отдающий готовые .br/.gz копии по Accept-Encoding клиента.
+    cache_control, если задан, проставляется всем ответам.
+    """
+
+    def __init__(self, *args, cache_control: Optional[str] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache_control = cache_control
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200) -> Response:
+        request_headers = Headers(scope=scope)
+        full_path = str(full_path)
+
+        if os.path.splitext(full_path)[1] not in COMPRESSIBLE_SUFFIXES:
+            return super().file_response(full_path, stat_result, scope, status_code)
+
+        response = None
+        encoding = choose_encoding(request_headers.get("accept-encoding"))
+        if encoding:
+            encoded_path = full_path + ENCODINGS[encoding]
+            try:
+                encoded_stat = os.stat(encoded_path)
+            except OSError:
+                encoded_stat = None
+            if encoded_stat is not None and encoded_stat.st_mtime >= stat_result.st_mtime:
+                media_type = mimetypes.guess_type(full_path)[0] or "text/plain"
+                response = FileResponse(
+                    encoded_path,
+                    status_code=status_code,
+                    stat_result=encoded_stat,
+                    media_type=media_type,
+                    headers={"Content-Encoding": encoding},
+                )
+
+        if response is None:
+            response = FileResponse(full_path, status_code=status_code, stat_result=stat_result)
+        response.headers["Vary"] = "Accept-Encoding"
+        if self.cache_control:
+            response.headers["Cache-Control"] = self.cache_control
+
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+if __name__ == "__main__":
+    for directory in sys.argv[1:] or ["app/static"]:
+        print(f"{directory}: сжато файлов — {precompress_directory(directory)}")
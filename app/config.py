@@ -10,9 +10,76 @@ class Settings:
     DB_NAME = os.getenv("DB_NAME", "postgres")
     DB_HOST = os.getenv("DB_HOST", "localhost")
     DB_PORT = os.getenv("DB_PORT", "5432")
+
+    # Движок и пул соединений
+    DB_ECHO = os.getenv("DB_ECHO", "false").lower() in ("1", "true", "yes")
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "5000"))
+    DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+
+    # Реплика для публичного чтения (необязательно). Учетные данные и база — как у основной
+    DB_REPLICA_HOST = os.getenv("DB_REPLICA_HOST")
+    DB_REPLICA_PORT = os.getenv("DB_REPLICA_PORT", DB_PORT)
+    # Сколько секунд после записи читать с основной базы, чтобы не увидеть отставшую реплику
+    DB_REPLICA_PIN_SECONDS = float(os.getenv("DB_REPLICA_PIN_SECONDS", "5"))
+
+    # Пул потоков для bcrypt: параллельные операции и допустимая очередь сверх них
+    BCRYPT_WORKERS = int(os.getenv("BCRYPT_WORKERS", str(min(4, os.cpu_count() or 1))))
+    BCRYPT_MAX_PENDING = int(os.getenv("BCRYPT_MAX_PENDING", "16"))
+
+    # Лимиты запросов к эндпоинтам с bcrypt: в минуту и допустимый всплеск
+    LOGIN_RATE_PER_MINUTE = float(os.getenv("LOGIN_RATE_PER_MINUTE", "10"))
+    LOGIN_RATE_BURST = int(os.getenv("LOGIN_RATE_BURST", "5"))
+    ACCOUNT_RATE_PER_MINUTE = float(os.getenv("ACCOUNT_RATE_PER_MINUTE", "5"))
+    ACCOUNT_RATE_BURST = int(os.getenv("ACCOUNT_RATE_BURST", "5"))
+    HASH_RATE_PER_MINUTE = float(os.getenv("HASH_RATE_PER_MINUTE", "5"))
+    HASH_RATE_BURST = int(os.getenv("HASH_RATE_BURST", "3"))
+
+    # Максимальный размер загружаемого изображения (байты)
+    UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(5 * 1024 * 1024)))
+    # Допуск на остальные поля multipart-формы сверх UPLOAD_MAX_BYTES (байты)
+    UPLOAD_FORM_OVERHEAD_BYTES = int(os.getenv("UPLOAD_FORM_OVERHEAD_BYTES", str(256 * 1024)))
+
+    # Уменьшенные копии изображений: бюджет дискового кэша, процессы для ресайза, качество WebP
+    IMAGE_VARIANT_CACHE_BYTES = int(os.getenv("IMAGE_VARIANT_CACHE_BYTES", str(200 * 1024 * 1024)))
+    IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", "2"))
+    IMAGE_VARIANT_QUALITY = int(os.getenv("IMAGE_VARIANT_QUALITY", "82"))
+
+    # Неиспользуемые загрузки моложе этого срока (секунды) очистка не удаляет
+    MEDIA_ORPHAN_GRACE_SECONDS = int(os.getenv("MEDIA_ORPHAN_GRACE_SECONDS", "86400"))
+
+    # /directions-with-disciplines: собирать JSON-документ одним запросом в Postgres (json_agg) вместо ORM
+    DIRECTIONS_JSON_IN_DB = os.getenv("DIRECTIONS_JSON_IN_DB", "false").lower() in ("1", "true", "yes")
+
+    # Фоновая проверка БД для /readyz (секунды)
+    HEALTH_PROBE_INTERVAL = float(os.getenv("HEALTH_PROBE_INTERVAL", "5"))
+    HEALTH_PROBE_TIMEOUT = float(os.getenv("HEALTH_PROBE_TIMEOUT", "2"))
+
+    # HTTP-кэширование публичных JSON-маршрутов (секунды)
+    PUBLIC_CACHE_MAX_AGE = int(os.getenv("PUBLIC_CACHE_MAX_AGE", "60"))
+    PUBLIC_CACHE_SWR = int(os.getenv("PUBLIC_CACHE_SWR", "600"))
     
     @property
     def DATABASE_URL(self):
         return f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASS}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
+    @property
+    def REPLICA_DATABASE_URL(self):
+        if not self.DB_REPLICA_HOST:
+            return None
+        return f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASS}@{self.DB_REPLICA_HOST}:{self.DB_REPLICA_PORT}/{self.DB_NAME}"
+
+    def cache_control(self, route: str) -> str:
+        """
+        Cache-Control для маршрута: CACHE_CONTROL_<ROUTE> из окружения или значение по умолчанию.
+        """
+        override = os.getenv(f"CACHE_CONTROL_{route.upper()}")
+        if override:
+            return override
+        return f"public, max-age={self.PUBLIC_CACHE_MAX_AGE}, stale-while-revalidate={self.PUBLIC_CACHE_SWR}"
+
 settings = Settings()
@@ -1,8 +1,47 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+import time
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session, sessionmaker
 from app.config import settings
 
-engine = create_async_engine(settings.DATABASE_URL, echo=True)
+def create_engine_from_settings(url: str) -> AsyncEngine:
+    """
+    Создает движок с параметрами пула и соединений из настроек.
+    """
+    return create_async_engine(
+        url,
+        echo=settings.DB_ECHO,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args={
+            # Кэш подготовленных выражений asyncpg (0 — выключить, нужно за pgbouncer)
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "server_settings": {
+                "statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS),
+                "application_name": "it-bgitu",
+            },
+        },
+    )
+
+def pool_stats(engine: AsyncEngine) -> dict:
+    """
+    Текущее состояние пула соединений.
+    """
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        # QueuePool считает overflow от -pool_size; наружу отдаем число сверх пула
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+    }
+
+engine = create_engine_from_settings(settings.DATABASE_URL)
 
 AsyncSessionLocal = sessionmaker(
     engine, 
@@ -10,6 +49,52 @@ AsyncSessionLocal = sessionmaker(
     expire_on_commit=False
 )
 
+if settings.REPLICA_DATABASE_URL:
+    replica_engine = create_engine_from_settings(settings.REPLICA_DATABASE_URL)
+else:
+    replica_engine = engine
+
+ReplicaSessionLocal = sessionmaker(
+    replica_engine,
+    class_=AsyncSession,
+    expire_on_commit=False
+)
+
+# Время последнего коммита с изменениями (в этом процессе)
+_last_write_at = 0.0
+
+def read_session() -> AsyncSession:
+    """
+    Сессия только для чтения: реплика, но сразу после записи — основная база
+    (read-after-write), пока реплика не догнала.
+    """
+    if time.monotonic() - _last_write_at < settings.DB_REPLICA_PIN_SECONDS:
+        return AsyncSessionLocal()
+    return ReplicaSessionLocal()
+
+@event.listens_for(Session, "after_flush")
+def _flag_flush(session, flush_context):
+    session.info["has_writes"] = True
+
+@event.listens_for(Session, "do_orm_execute")
+def _flag_statement(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["has_writes"] = True
+
+@event.listens_for(Session, "after_commit")
+def _pin_after_write(session):
+    global _last_write_at
+    if session.info.pop("has_writes", False):
+        _last_write_at = time.monotonic()
+
+@event.listens_for(Session, "after_rollback")
+def _clear_write_flag(session):
+    session.info.pop("has_writes", None)
+
 async def get_db():
     async with AsyncSessionLocal() as session:
         yield session
+
+async def get_read_db():
+    async with read_session() as session:
+        yield session
@@ -0,0 +1,94 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.config import settings
+from app.database import engine, replica_engine, pool_stats
+
+logger = logging.getLogger(__name__)
+
+
+class DatabaseProbe:
+    """
+    Фоновая проверка БД: раз в interval секунд выполняет SELECT 1 с таймаутом
+    и запоминает результат. Пробы оркестратора читают готовый результат и
+    не занимают соединения из пула.
+    """
+
+    def __init__(self, engine: AsyncEngine, interval: float, timeout: float):
+        self.engine = engine
+        self.interval = interval
+        self.timeout = timeout
+        self.ok = False
+        self.error: Optional[str] = "проверка еще не выполнялась"
+        self.latency_ms: Optional[float] = None
+        self.checked_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def _select_one(self) -> None:
+        async with self.engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    async def check(self) -> None:
+        started = time.monotonic()
+        try:
+            # Таймаут покрывает и получение соединения, и сам запрос
+            await asyncio.wait_for(self._select_one(), timeout=self.timeout)
+            self.ok, self.error = True, None
+        except Exception as e:
+            if self.ok or self.checked_at is None:
+                logger.warning("DB probe failed: %r", e)
+            self.ok, self.error = False, str(e) or type(e).__name__
+        self.latency_ms = round((time.monotonic() - started) * 1000, 2)
+        self.checked_at = time.monotonic()
+
+    async def _run(self) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    @property
+    def fresh(self) -> bool:
+        # Зависшая фоновая задача не должна оставлять под «готов» старый успешный результат
+        return self.checked_at is not None and time.monotonic() - self.checked_at < self.interval * 3 + self.timeout
+
+    def timing(self) -> dict:
+        """
+        Задержка последней проверки и сколько секунд назад она была.
+        """
+        age = None if self.checked_at is None else round(time.monotonic() - self.checked_at, 2)
+        return {"latency_ms": self.latency_ms, "checked_ago_s": age}
+
+    def status(self) -> dict:
+        return {
+            "db_status": self.ok and self.fresh,
+            "error": self.error if self.fresh else (self.error or "результат проверки устарел"),
+            **self.timing(),
+        }
+
+
+def pools() -> dict:
+    stats = {"primary": pool_stats(engine)}
+    if replica_engine is not engine:
+        stats["replica"] = pool_stats(replica_engine)
+    return stats
+
+
+db_probe = DatabaseProbe(engine, settings.HEALTH_PROBE_INTERVAL, settings.HEALTH_PROBE_TIMEOUT)
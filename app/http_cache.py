@@ -0,0 +1,75 @@
+import secrets
+
+from fastapi import Request, Response
+
+from app.cache import SnapshotCache
+from app.compression import MIN_SIZE, choose_encoding
+from app.config import settings
+
+# Метка запуска процесса: версии снимков начинаются с нуля после рестарта,
+# поэтому без неё ETag разных запусков мог бы совпасть при разном содержимом.
+BOOT_ID = secrets.token_hex(4)
+
+# Для ресурсов, чье содержимое по данному URL никогда не меняется
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+def make_etag(name: str, version: int, encoding: str = None) -> str:
+    # Сжатое и несжатое тело — разные представления, у них должны быть разные ETag
+    suffix = f"-{encoding}" if encoding else ""
+    return f'"{BOOT_ID}-{name}-{version}{suffix}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Проверяет If-None-Match (слабое сравнение, как требует RFC 9110).
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+async def cached_response(
+    request: Request,
+    cache: SnapshotCache,
+    name: str,
+    route: str = None,
+    media_type: str = "application/json",
+) -> Response:
+    """
+    Отдает снимок с ETag и Cache-Control. Совпавший If-None-Match дает 304
+    без обращения к снимку и к БД — версия известна заранее.
+    Сжатые варианты тела строятся один раз на версию снимка.
+    """
+    encoding = choose_encoding(request.headers.get("accept-encoding"))
+    version = cache.version(name)
+    headers = {
+        "Cache-Control": settings.cache_control(route or name),
+        "Vary": "Accept-Encoding",
+    }
+
+    # Маленькие тела отдаются без сжатия, поэтому у клиента может быть любой из двух ETag
+    for etag in {make_etag(name, version, encoding), make_etag(name, version)}:
+        if etag_matches(request, etag):
+            headers["ETag"] = etag
+            return Response(status_code=304, headers=headers)
+
+    snapshot = await cache.get(name)
+    body = snapshot.body
+    if encoding and len(body) >= MIN_SIZE:
+        body = await snapshot.encoded(encoding)
+        headers["Content-Encoding"] = encoding
+    else:
+        encoding = None
+    # Во время сборки версия могла уйти вперед — ETag должен описывать отданное тело
+    headers["ETag"] = make_etag(name, snapshot.version, encoding)
+    return Response(content=body, media_type=media_type, headers=headers)
@@ -0,0 +1,171 @@
+import asyncio
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.uploads import UPLOAD_DIR
+
+VARIANT_DIR = UPLOAD_DIR / ".variants"
+
+# Размеры, которые реально нужны интерфейсу: миниатюра в админке и карточка преподавателя (1x/2x).
+# Произвольные размеры не принимаем, иначе кэш можно забить мусорными вариантами.
+ALLOWED_SIZES = {(100, 100), (360, 360), (720, 720)}
+
+_NAME_RE = re.compile(r"^[A-Za-z0-9_-]+\.(jpg|jpeg|png|webp)$")
+
+
+class UnreadableImage(Exception):
+    """
+    Исходник не удалось разобрать (битый файл, не изображение или «декомпрессионная бомба»).
+    """
+
+
+def media_variant_url(url: Optional[str], width: int, height: int) -> Optional[str]:
+    """
+    /media/<name> -> /media/<w>x<h>/<name>. Внешние и пустые ссылки возвращает как есть.
+    """
+    if not url or not url.startswith("/media/"):
+        return url
+    name = url[len("/media/"):]
+    if not _NAME_RE.match(name):
+        return url
+    return f"/media/{width}x{height}/{name}"
+
+
+def _render_variant(source: str, target: str, width: int, height: int, quality: int) -> int:
+    """
+    Выполняется в отдельном процессе: обрезка под размер (как object-fit: cover,
+    по верхнему краю — на фото преподавателей важнее лицо) и сохранение в WebP.
+    """
+    from PIL import Image, ImageOps, UnidentifiedImageError
+
+    tmp_target = target + ".part"
+    try:
+        with Image.open(source) as image:
+            image = ImageOps.exif_transpose(image)
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+            variant = ImageOps.fit(image, (width, height), method=Image.LANCZOS, centering=(0.5, 0.0))
+            variant.save(tmp_target, "WEBP", quality=quality, method=4)
+    except (Image.DecompressionBombError, UnidentifiedImageError, SyntaxError, ValueError) as e:
+        # Исключения Pillow переводим в свое: его понимает обработчик маршрута
+        if os.path.exists(tmp_target):
+            os.unlink(tmp_target)
+        raise UnreadableImage(f"{type(e).__name__}: {e}") from None
+    os.replace(tmp_target, target)
+    return os.path.getsize(target)
+
+
+class VariantCache:
+    """
+    Дисковый кэш уменьшенных копий с бюджетом по байтам и вытеснением LRU.
+
+    Время последнего использования — mtime файла (обновляется при каждой выдаче),
+    поэтому порядок вытеснения переживает перезапуск процесса.
+
+    Пул процессов создается при старте приложения (start) и с контекстом spawn:
+    fork процесса, в котором уже работают потоки (пулы bcrypt и run_in_threadpool), небезопасен.
+    """
+
+    def __init__(self, directory: Path, budget_bytes: int, workers: int):
+        self.directory = directory
+        self.budget_bytes = budget_bytes
+        self.workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._sizes: Optional[Dict[str, int]] = None
+
+    def _scan(self) -> Dict[str, int]:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        return {
+            entry.name: entry.stat().st_size
+            for entry in os.scandir(self.directory)
+            if entry.is_file() and entry.name.endswith(".webp")
+        }
+
+    def _touch(self, path: Path) -> None:
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+
+    def _evict(self, keep: str) -> None:
+        total = sum(self._sizes.values())
+        if total <= self.budget_bytes:
+            return
+        entries = []
+        for name in list(self._sizes):
+            try:
+                entries.append((os.stat(self.directory / name).st_mtime, name))
+            except FileNotFoundError:
+                total -= self._sizes.pop(name)
+        for _, name in sorted(entries):
+            if total <= self.budget_bytes:
+                break
+            if name == keep:
+                continue
+            try:
+                os.unlink(self.directory / name)
+            except FileNotFoundError:
+                pass
+            total -= self._sizes.pop(name, 0)
+
+    async def get(self, name: str, size: Tuple[int, int]) -> Optional[Path]:
+        """
+        Путь к варианту name размера size; None, если исходника нет.
+        """
+        width, height = size
+        stem = name.rsplit(".", 1)[0]
+        variant_name = f"{stem}-{width}x{height}.webp"
+        target = self.directory / variant_name
+
+        if self._sizes is None:
+            self._sizes = await run_in_threadpool(self._scan)
+
+        if variant_name in self._sizes and target.exists():
+            await run_in_threadpool(self._touch, target)
+            return target
+
+        source = UPLOAD_DIR / name
+        if not source.is_file():
+            return None
+
+        # Одновременные запросы одного варианта ждут одну и ту же сборку
+        pending = self._pending.get(variant_name)
+        if pending is None:
+            pending = asyncio.ensure_future(self._render(source, target, width, height))
+            self._pending[variant_name] = pending
+            pending.add_done_callback(lambda _: self._pending.pop(variant_name, None))
+        await asyncio.shield(pending)
+        return target
+
+    def start(self) -> None:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+    async def _render(self, source: Path, target: Path, width: int, height: int) -> None:
+        # Без lifespan (скрипты, тесты) пул создается при первом ресайзе
+        self.start()
+        loop = asyncio.get_running_loop()
+        size = await loop.run_in_executor(
+            self._executor, _render_variant, str(source), str(target), width, height, settings.IMAGE_VARIANT_QUALITY
+        )
+        self._sizes[target.name] = size
+        await run_in_threadpool(self._evict, target.name)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+variant_cache = VariantCache(VARIANT_DIR, settings.IMAGE_VARIANT_CACHE_BYTES, settings.IMAGE_WORKERS)
@@ -1,4 +1,8 @@
+import hashlib
 import os
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, Any
 from jose import JWTError, jwt
@@ -10,6 +14,52 @@ load_dotenv()
 SECRET_KEY = os.getenv("SECRET_KEY", "fallback-secret-key-change-me")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+VERIFIED_TOKEN_CACHE_SIZE = int(os.getenv("VERIFIED_TOKEN_CACHE_SIZE", "1024"))
+
+class VerifiedTokenCache:
+    """
+    LRU уже проверенных токенов: ключ — SHA-256 токена, запись живет до его exp.
+    Подпись проверяется один раз на токен, а не на каждый запрос.
+    """
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[bytes, tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        key = self.key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, payload = entry
+                if expires_at > time.time():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return payload
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, token: str, payload: Dict[str, Any]) -> None:
+        exp = payload.get("exp")
+        # Токены без exp не кэшируем: у записи не было бы срока жизни
+        if not isinstance(exp, (int, float)) or self.maxsize <= 0:
+            return
+        key = self.key(token)
+        with self._lock:
+            self._entries[key] = (float(exp), payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
 
 class JWTManager:
     def __init__(self):
@@ -19,6 +69,7 @@ class JWTManager:
         self.secret_key = SECRET_KEY
         self.algorithm = ALGORITHM
         self.access_token_expire_minutes = ACCESS_TOKEN_EXPIRE_MINUTES
+        self.verified_tokens = VerifiedTokenCache(VERIFIED_TOKEN_CACHE_SIZE)
     
     def create_access_token(self, data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
         to_encode = data.copy()
@@ -37,9 +88,20 @@ class JWTManager:
             return jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
         except JWTError:
             return None
+
+    def verify_token_cached(self, token: str) -> Optional[Dict[str, Any]]:
+        """
+        verify_token с кэшем проверенных токенов. Невалидные токены не кэшируются.
+        """
+        payload = self.verified_tokens.get(token)
+        if payload is None:
+            payload = self.verify_token(token)
+            if payload is not None:
+                self.verified_tokens.put(token, payload)
+        return payload
     
     def get_user_id_from_token(self, token: str) -> Optional[int]:
-        payload = self.verify_token(token)
+        payload = self.verify_token_cached(token)
         if payload is None:
             return None
         
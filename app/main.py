@@ -1,16 +1,33 @@
 import os
 import uvicorn
 from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
+from contextlib import asynccontextmanager
 from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 
-from app.routers import auth, cms, public
+from app.routers import auth, cms, health, media, public
 from app.admin import setup_admin
+from app.compression import PrecompressedStaticFiles, precompress_directory
+from app.health import db_probe
+from app.images import variant_cache
+from app.uploads import MediaStaticFiles, UploadLimitMiddleware
+from app.assets import DIST_DIR, URL_PREFIX, refresh_assets
+from app.http_cache import IMMUTABLE
 
-app = FastAPI(title="IT BGITU Remake")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # В образе копии создаются при сборке; здесь — дособираем то, что поменялось (dev)
+    refresh_assets()
+    precompress_directory("app/static")
+    precompress_directory(DIST_DIR)
+    db_probe.start()
+    variant_cache.start()
+    yield
+    await db_probe.stop()
+    variant_cache.shutdown()
+
+app = FastAPI(title="IT BGITU Remake", lifespan=lifespan)
 
 app.add_middleware(ProxyHeadersMiddleware, trusted_hosts="*")
 
@@ -23,6 +40,9 @@ class ForceHTTPSMiddleware(BaseHTTPMiddleware):
 
 app.add_middleware(ForceHTTPSMiddleware)
 
+# Слишком большие загрузки отклоняются до того, как тело будет принято целиком
+app.add_middleware(UploadLimitMiddleware)
+
 SECRET_KEY = os.getenv("SECRET_KEY", "fallback-secret-key-change-me")
 app.add_middleware(
     SessionMiddleware,
@@ -31,15 +51,20 @@ app.add_middleware(
     same_site="lax"
 )
 
-app.mount("/static", StaticFiles(directory="app/static"), name="static")
-os.makedirs("app/uploads", exist_ok=True)
-app.mount("/media", StaticFiles(directory="app/uploads"), name="upload")
-
-templates = Jinja2Templates(directory="app/templates")
+# Файлы с хэшем в имени: при изменении содержимого меняется и URL
+os.makedirs(DIST_DIR, exist_ok=True)
+app.mount(URL_PREFIX, PrecompressedStaticFiles(directory=DIST_DIR, cache_control=IMMUTABLE), name="assets")
+app.mount("/static", PrecompressedStaticFiles(directory="app/static"), name="static")
 
+app.include_router(health.router)
 app.include_router(public.router)
 app.include_router(auth.router)
 app.include_router(cms.router)
+app.include_router(media.router)
+
+# Монтируется после роутеров, иначе перехватит /media/{w}x{h}/...
+os.makedirs("app/uploads", exist_ok=True)
+app.mount("/media", MediaStaticFiles(directory="app/uploads"), name="upload")
 
 setup_admin(app)
 
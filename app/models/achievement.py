@@ -1,10 +1,18 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Text
+from sqlalchemy import Column, Computed, Index, Integer, String, ForeignKey, Text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred
 from app.models import Base
 
 class Achievement(Base):
     __tablename__ = 'achievements'
+    __table_args__ = (
+        Index("ix_achievements_search", "search_vector", postgresql_using="gin"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     theme = Column(String, index=True, nullable=False)
-    title = Column(String, index=True, nullable=False)
+    title = Column(String, index=True, nullable=False, unique=True)
     description = Column(Text, nullable=False)
+    search_vector = deferred(Column(TSVECTOR, Computed(
+        "to_tsvector('russian', coalesce(title, '') || ' ' || coalesce(description, ''))", persisted=True
+    )))
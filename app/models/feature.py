@@ -6,6 +6,6 @@ class Feature(Base):
     __tablename__ = 'features'
 
     id = Column(Integer, primary_key=True, index=True)
-    title = Column(String, index=True, nullable=False)
+    title = Column(String, index=True, nullable=False, unique=True)
     description = Column(Text, nullable=False)
     svg_code = Column(Text, nullable=True)
\ No newline at end of file
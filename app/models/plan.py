@@ -1,8 +1,11 @@
 # app/models/plan.py
-from sqlalchemy import Column, Integer, String, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, ForeignKey, UniqueConstraint, CheckConstraint, Computed, Index
+from sqlalchemy.dialects.postgresql import INT4RANGE, TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from app.models import Base
 
+TERMS_EXPRESSION = "CASE WHEN start_term <= end_term THEN int4range(start_term, end_term, '[]') END"
+
 class Direction(Base):
     __tablename__ = 'directions'
 
@@ -16,6 +19,13 @@ class Direction(Base):
 
 class Discipline(Base):
     __tablename__ = "disciplines"
+    __table_args__ = (
+        UniqueConstraint("direction_id", "name", name="disciplines_direction_id_name_key"),
+        CheckConstraint("start_term <= end_term", name="ck_disciplines_terms"),
+        # Запросы «семестр N направления D» и «пересекается с X–Y» (нужен btree_gist)
+        Index("ix_disciplines_direction_id_terms", "direction_id", "terms", postgresql_using="gist"),
+        Index("ix_disciplines_search", "search_vector", postgresql_using="gin"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True, nullable=False)
@@ -23,6 +33,12 @@ class Discipline(Base):
     end_term = Column(Integer, nullable=False)
     group = Column(String, nullable=False, server_default='Общие')
     direction_id = Column(Integer, ForeignKey('directions.id', ondelete='CASCADE'), nullable=False)
+    # Семестры включительно: [start_term, end_term]. Считает база, из кода не пишется.
+    # CASE: иначе int4range падает раньше проверки ck_disciplines_terms, и вместо
+    # понятной ошибки ограничения (400) клиент получает 500
+    terms = Column(INT4RANGE, Computed(TERMS_EXPRESSION, persisted=True))
+    # Полнотекстовый поиск (app/search.py); отложенная — обычные выборки её не читают
+    search_vector = deferred(Column(TSVECTOR, Computed("to_tsvector('russian', coalesce(name, ''))", persisted=True)))
 
     direction = relationship("Direction", back_populates="disciplines")
 
@@ -1,11 +1,19 @@
 # app/models/subject.py
-from sqlalchemy import Column, Integer, String, Text
+from sqlalchemy import Column, Computed, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred
 from app.models import Base
 
 class Subject(Base):
     __tablename__ = 'subjects'
+    __table_args__ = (
+        Index("ix_subjects_search", "search_vector", postgresql_using="gin"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True, nullable=False, unique=True)
     description = Column(String, nullable=False)
-    svg_code = Column(Text, nullable=True) # Поле в базе данных
\ No newline at end of file
+    svg_code = Column(Text, nullable=True) # Поле в базе данных
+    search_vector = deferred(Column(TSVECTOR, Computed(
+        "to_tsvector('russian', coalesce(name, '') || ' ' || coalesce(description, ''))", persisted=True
+    )))
\ No newline at end of file
@@ -1,11 +1,22 @@
-from sqlalchemy import Column, Integer, String, ARRAY
+from sqlalchemy import Column, Computed, Integer, String, Index
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
+from sqlalchemy.orm import deferred
 from app.models import Base
 
 class Teacher(Base):
     __tablename__ = 'teachers'
+    __table_args__ = (
+        # Для фильтра subjects @> ARRAY[...] (/teachers?subject=)
+        Index("ix_teachers_subjects", "subjects", postgresql_using="gin"),
+        Index("ix_teachers_search", "search_vector", postgresql_using="gin"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    image_url = Column(String, unique=True, nullable=False)
+    # Не уникально: одинаковые фото хранятся одним файлом
+    image_url = Column(String, nullable=False)
     fio = Column(String, unique=True, index=True, nullable=False)
     post = Column(String, nullable=False)
     subjects = Column(ARRAY(String(100)), nullable=False, default=[])
+    search_vector = deferred(Column(TSVECTOR, Computed(
+        "to_tsvector('russian', coalesce(fio, '') || ' ' || coalesce(post, ''))", persisted=True
+    )))
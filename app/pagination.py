@@ -0,0 +1,86 @@
+import base64
+from typing import Any, Optional, Type
+
+import orjson
+from fastapi import HTTPException, Response, status
+from pydantic import BaseModel
+from sqlalchemy import select
+
+from app.config import settings
+
+# Страница без limit — не больше стольких строк
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(value: Any) -> str:
+    """
+    Курсор непрозрачен для клиента: это значение ключа сортировки последней строки.
+    """
+    return base64.urlsafe_b64encode(orjson.dumps([value])).decode("ascii").rstrip("=")
+
+
+def _invalid_cursor() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Некорректный курсор"
+    )
+
+
+def decode_cursor(cursor: str) -> Any:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        (value,) = orjson.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError):
+        raise _invalid_cursor()
+    return value
+
+
+def cursor_value(sort_column, cursor: str) -> Any:
+    """
+    Значение из курсора, проверенное по типу колонки: иначе чужой курсор
+    (строка вместо id) дошел бы до Postgres и вернулся ошибкой 500.
+    """
+    value = decode_cursor(cursor)
+    expected = sort_column.type.python_type
+    # bool — подкласс int, но ключом сортировки не бывает
+    if isinstance(value, bool) or not isinstance(value, expected):
+        raise _invalid_cursor()
+    return value
+
+
+async def keyset_page(
+    session,
+    model,
+    schema: Type[BaseModel],
+    sort_column,
+    after: Optional[str],
+    limit: Optional[int],
+    *filters,
+) -> dict:
+    """
+    Страница {"items": [...], "next": курсор или None} по ключу sort_column
+    (уникальная колонка с индексом: WHERE key > :after ORDER BY key LIMIT n).
+    В отличие от OFFSET, цена страницы не растет с ее номером.
+    """
+    limit = limit or DEFAULT_PAGE_SIZE
+    query = select(model).where(*filters).order_by(sort_column).limit(limit + 1)
+    if after is not None:
+        query = query.where(sort_column > cursor_value(sort_column, after))
+
+    result = await session.execute(query)
+    rows = result.scalars().all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    items = [schema.model_validate(row).model_dump() for row in rows]
+    next_cursor = encode_cursor(getattr(rows[-1], sort_column.key)) if has_more else None
+    return {"items": items, "next": next_cursor}
+
+
+def page_response(page: dict, route: str) -> Response:
+    return Response(
+        content=orjson.dumps(page),
+        media_type="application/json",
+        headers={"Cache-Control": settings.cache_control(route)},
+    )
@@ -0,0 +1,76 @@
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from fastapi import HTTPException, Request, status
+
+from app.config import settings
+
+
+class TokenBucketLimiter:
+    """
+    Token bucket в памяти процесса: у каждого ключа до burst жетонов,
+    пополнение — rate_per_minute в минуту. Число ключей ограничено (LRU),
+    чтобы поток запросов с разных адресов не раздувал память.
+    """
+
+    def __init__(self, rate_per_minute: float, burst: int, max_keys: int = 10000):
+        self.rate = rate_per_minute / 60.0
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, tuple[float, float]]" = OrderedDict()
+
+    def acquire(self, key: str) -> float:
+        """
+        Забирает жетон. Возвращает 0, если запрос разрешен, иначе — через сколько секунд повторить.
+        """
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(key, (float(self.burst), now))
+        tokens = min(float(self.burst), tokens + (now - updated) * self.rate)
+
+        if tokens >= 1:
+            retry_after = 0.0
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / self.rate if self.rate > 0 else 60.0
+
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return retry_after
+
+
+login_ip_limiter = TokenBucketLimiter(settings.LOGIN_RATE_PER_MINUTE, settings.LOGIN_RATE_BURST)
+login_account_limiter = TokenBucketLimiter(settings.ACCOUNT_RATE_PER_MINUTE, settings.ACCOUNT_RATE_BURST)
+hash_ip_limiter = TokenBucketLimiter(settings.HASH_RATE_PER_MINUTE, settings.HASH_RATE_BURST)
+
+
+def too_many_requests(retry_after: float = 1) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Слишком много запросов, попробуйте позже",
+        headers={"Retry-After": str(max(1, int(retry_after + 0.999)))},
+    )
+
+
+def client_ip(request: Request) -> str:
+    # За Caddy адрес клиента уже подставлен ProxyHeadersMiddleware из X-Forwarded-For
+    return request.client.host if request.client else "unknown"
+
+
+def check_login_rate(request: Request, account: Optional[str]) -> None:
+    """
+    Лимит попыток входа по IP и по учетной записи. Вызывать до проверки пароля.
+    """
+    retry_after = login_ip_limiter.acquire(client_ip(request))
+    if not retry_after and account:
+        retry_after = login_account_limiter.acquire(account.strip().lower())
+    if retry_after:
+        raise too_many_requests(retry_after)
+
+
+def check_hash_rate(request: Request) -> None:
+    retry_after = hash_ip_limiter.acquire(client_ip(request))
+    if retry_after:
+        raise too_many_requests(retry_after)
@@ -1,26 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Form
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Form
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from app.database import get_db
 from app.models.user import User
 from app.schemas.auth import Token, LoginRequest
-from app.security import verify_password, get_password_hash
+from app.security import password_hasher, PasswordServiceBusy
 from app.jwt_manager import jwt_manager
+from app.ratelimit import check_hash_rate, check_login_rate, too_many_requests
 
 router = APIRouter(prefix="/api/auth", tags=["Authentification"])
 
 @router.post("/login", response_model=Token)
 async def login(
     login_data: LoginRequest,
+    request: Request,
     db: AsyncSession = Depends(get_db)
 ):
+    check_login_rate(request, login_data.email)
+
     result = await db.execute(
         select(User).where(User.email == login_data.email)
     )
     user = result.scalar_one_or_none()
+
+    try:
+        password_ok = user is not None and await password_hasher.verify(login_data.password, user.hashed_password)
+    except PasswordServiceBusy:
+        raise too_many_requests()
     
-    if not user or not verify_password(login_data.password, user.hashed_password):
+    if not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Неверный email или пароль",
@@ -36,10 +45,12 @@ async def login(
     return Token(access_token=access_token)
 
 @router.post("/hash-password")
-async def hash_password_endpoint(password: str = Form(..., min_length=6)):
+async def hash_password_endpoint(request: Request, password: str = Form(..., min_length=6)):
     """
     Получить хэш пароля для ручного создания пользователя в БД.
     """
+    check_hash_rate(request)
+
     password_bytes = password.encode('utf-8')
     original_length = len(password_bytes)
     
@@ -48,7 +59,10 @@ async def hash_password_endpoint(password: str = Form(..., min_length=6)):
     else:
         warning = None
     
-    hashed_password = get_password_hash(password)
+    try:
+        hashed_password = await password_hasher.hash(password)
+    except PasswordServiceBusy:
+        raise too_many_requests()
     
     return {
         "original_password": password,
@@ -1,16 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.exc import IntegrityError
 from typing import List, Optional
-from sqlalchemy.orm import joinedload
 from sqlalchemy import func
-import shutil
-import uuid
-from pathlib import Path
+from starlette.concurrency import run_in_threadpool
 
 from app.database import get_db
 from app.dependencies import get_current_user
+from app.config import settings
+from app.images import VARIANT_DIR
+from app.uploads import (
+    save_image, UploadRejected, collect_references, list_blobs, orphaned_blobs, remove_blobs
+)
 
 from app.models.speciality import Speciality
 from app.models.feature import Feature
@@ -54,6 +56,9 @@ from app.schemas.achievement import (
     AchievementCreate,
     AchievementUpdate
 )
+from app.schemas.media import MediaBlob, MediaPruneResult
+from app.schemas.batch import BatchRequest, BatchResult
+from app.cms_entities import ENTITIES, run_batch, create_row, update_row, delete_row
 
 from app.security import verify_password, get_password_hash
 from app.jwt_manager import jwt_manager
@@ -65,30 +70,57 @@ async def upload_image(
     file: UploadFile = File(...),
     current_user_id: int = Depends(get_current_user)
 ):
-    if file.content_type not in ["image/jpeg", "image/png", "image/webp"]:
-         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Только изображения (jpg, png, webp)"
-            )
-
-    file_extension = file.filename.split(".")[-1]
-    unique_filename = f"{uuid.uuid4()}.{file_extension}"
-
-    save_directory = Path("app/uploads")
-    save_directory.mkdir(parents=True, exist_ok=True)
-
-    save_path = save_directory / unique_filename
-
     try:
-        with open(save_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-    except Exception as e:
+        url = await save_image(file)
+    except UploadRejected as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=e.detail
+        )
+    except OSError:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Ошибка сохранения файла"
         )
 
-    return {"url": f"/media/{unique_filename}"}
+    return {"url": url}
+
+@router.get("/media", response_model=List[MediaBlob])
+async def media_list(
+    db: AsyncSession = Depends(get_db),
+    current_user_id: int = Depends(get_current_user)
+):
+    """
+    Загруженные файлы и строки, которые на них ссылаются.
+    """
+    references = await collect_references(db)
+    blobs = await run_in_threadpool(list_blobs)
+    return [
+        MediaBlob(
+            name=name,
+            url=f"/media/{name}",
+            size=stat_result.st_size,
+            references=references.get(name, []),
+        )
+        for name, stat_result in sorted(blobs.items())
+    ]
+
+@router.delete("/media/orphans", response_model=MediaPruneResult)
+async def media_prune(
+    db: AsyncSession = Depends(get_db),
+    current_user_id: int = Depends(get_current_user)
+):
+    """
+    Удалить файлы, на которые не ссылается ни одна строка.
+    """
+    references = await collect_references(db)
+    blobs = await run_in_threadpool(list_blobs)
+    orphans = orphaned_blobs(blobs, references, settings.MEDIA_ORPHAN_GRACE_SECONDS)
+    await run_in_threadpool(remove_blobs, orphans, VARIANT_DIR)
+    return MediaPruneResult(
+        removed=orphans,
+        freed_bytes=sum(blobs[name].st_size for name in orphans),
+    )
 
 @router.post("/subject")
 async def subject_create(
@@ -99,26 +131,11 @@ async def subject_create(
     """
     Создание нового предмета.
     """
-    result = await db.execute(select(Subject).where(Subject.name == subject_data.name))
-    if result.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Такой предмет уже существует"
-        )
-    
-    subject = Subject(**subject_data.model_dump())
-    try:
-        db.add(subject)
-        await db.commit()
-        await db.refresh(subject)
-    except IntegrityError:
-        await db.rollback()
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Ошибка при создании предмета"
-        )
-    
-    return subject
+    return await create_row(
+        db, ENTITIES["subject"], subject_data.model_dump(),
+        duplicate_detail="Такой предмет уже существует",
+        error_detail="Ошибка при создании предмета"
+    )
 
 @router.put("/subject/{subject_id}")
 async def subject_update(
@@ -130,44 +147,11 @@ async def subject_update(
     """
     Обновить предмет.
     """
-    result = await db.execute(select(Subject).where(Subject.id == subject_id))
-    subject = result.scalar_one_or_none()
-    
-    if not subject:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Предмет не найден"
-        )
-    
-    update_data = subject_data.model_dump(exclude_unset=True)
-    
-    if "name" in update_data:
-        result = await db.execute(
-            select(Subject).where(
-                Subject.name == update_data["name"],
-                Subject.id != subject_id
-            )
-        )
-        if result.scalar_one_or_none():
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Предмет с таким названием уже существует"
-            )
-    
-    for field, value in update_data.items():
-        setattr(subject, field, value)
-    
-    try:
-        await db.commit()
-        await db.refresh(subject)
-    except IntegrityError:
-        await db.rollback()
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Ошибка при обновлении предмета"
-        )
-    
-    return subject
+    return await update_row(
+        db, ENTITIES["subject"], subject_id, subject_data.model_dump(exclude_unset=True),
+        duplicate_detail="Предмет с таким названием уже существует",
+        error_detail="Ошибка при обновлении предмета"
+    )
 
 @router.delete("/subject/{subject_id}")
 async def subject_delete(
@@ -178,25 +162,7 @@ async def subject_delete(
     """
     Удаление предмета.
     """
-    result = await db.execute(select(Subject).where(Subject.id == subject_id))
-    subject = result.scalar_one_or_none()
-
-    if not subject:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Предмет не найден"
-        )
-    
-    try:
-        await db.delete(subject)
-        await db.commit()
-    except Exception:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Ошибка при удалении"
-        )
-    
-    return subject
+    return await delete_row(db, ENTITIES["subject"], subject_id, "Ошибка при удалении")
 
 @router.post("/feature")
 async def feature_create(
@@ -207,26 +173,11 @@ async def feature_create(
     """
     Создание нового преимущества.
     """
-    result = await db.execute(select(Feature).where(Feature.title == feature_data.title))
-    if result.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Такое объект уже существует"
-        )
-    
-    feature = Feature(**feature_data.model_dump())
-    try:
-        db.add(feature)
-        await db.commit()
-        await db.refresh(feature)
-    except IntegrityError:
-        await db.rollback()
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Ошибка при создании объекта"
-        )
-    
-    return feature
+    return await create_row(
+        db, ENTITIES["feature"], feature_data.model_dump(),
+        duplicate_detail="Такое объект уже существует",
+        error_detail="Ошибка при создании объекта"
+    )
 
 @router.put("/feature/{feature_id}")
 async def feature_update(
@@ -238,73 +189,22 @@ async def feature_update(
     """
     Обновить преимущество
     """
-    result = await db.execute(select(Feature).where(Feature.id == feature_id))
-    feature = result.scalar_one_or_none()
+    return await update_row(
+        db, ENTITIES["feature"], feature_id, feature_data.model_dump(exclude_unset=True),
+        duplicate_detail="Объект с таким названием уже существует",
+        error_detail="Ошибка при обновлении объекта"
+    )
 
-    if not feature:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Обект не найден"
-        )
-    
-    update_data = feature_data.model_dump(exclude_unset=True)
-    
-    if "title" in update_data:
-        result = await db.execute(
-            select(Feature).where(
-                Feature.title == update_data["title"],
-                Feature.id != feature_id
-            )
-        )
-        if result.scalar_one_or_none():
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Объект с таким названием уже существует"
-            )
-    
-    for field, value in update_data.items():
-        setattr(feature, field, value)
-    
-    try:
-        await db.commit()
-        await db.refresh(feature)
-    except IntegrityError:
-        await db.rollback()
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Ошибка при обновлении объекта"
-        )
-    
-    return feature
-    
 @router.delete("/feature/{feature_id}")
 async def feature_delete(
     feature_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user_id:int = Depends(get_current_user)
+    current_user_id: int = Depends(get_current_user)
 ):
     """
     Удаление преимущества
     """
-    result = await db.execute(select(Feature).where(Feature.id == feature_id))
-    feature = result.scalar_one_or_none()
-
-    if not feature:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Объект не найден"
-        )
-    
-    try:
-        await db.delete(feature)
-        await db.commit()
-    except Exception:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Ошибка при удалении объекта"
-        )
-    
-    return feature
+    return await delete_row(db, ENTITIES["feature"], feature_id, "Ошибка при удалении объекта")
 
 @router.post("/speciality")
 async def speciality_create(
@@ -315,27 +215,11 @@ async def speciality_create(
     """
     Создание новой специальности
     """
-    result = await db.execute(select(Speciality).where(Speciality.name == speciality_data.name))
-
-    if result.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Спесиальность с таким названием уже существует"
-        )
-    
-    speciality = Speciality(**speciality_data.model_dump())
-    try:
-        db.add(speciality)
-        await db.commit()
-        await db.refresh(speciality)
-    except IntegrityError:
-        await db.rollback()
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Ошибка при создании специальности"
-        )
-    
-    return speciality
+    return await create_row(
+        db, ENTITIES["speciality"], speciality_data.model_dump(),
+        duplicate_detail="Спесиальность с таким названием уже существует",
+        error_detail="Ошибка при создании специальности"
+    )
 
 @router.put("/speciality/{speciality_id}")
 async def speciality_update(
@@ -347,44 +231,11 @@ async def speciality_update(
     """
     Редактирование специальности
     """
-    result = await db.execute(select(Speciality).where(Speciality.id == speciality_id))
-    speciality = result.scalar_one_or_none()
-
-    if not speciality:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Специальность не найдена"
-        )
-    
-    update_data = speciality_data.model_dump(exclude_unset=True)
-    
-    if "name" in update_data:
-        result = await db.execute(
-            select(Speciality).where(
-                Speciality.name == update_data["name"],
-                Speciality.id != speciality_id
-            )
-        )
-        if result.scalar_one_or_none():
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Специальность с таким названием уже существует"
-            )
-    
-    for field, value in update_data.items():
-        setattr(speciality, field, value)
-    
-    try:
-        await db.commit()
-        await db.refresh(speciality)
-    except IntegrityError:
-        await db.rollback()
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Ошибка при обновлении специальности"
-        )
-    
-    return speciality
+    return await update_row(
+        db, ENTITIES["speciality"], speciality_id, speciality_data.model_dump(exclude_unset=True),
+        duplicate_detail="Специальность с таким названием уже существует",
+        error_detail="Ошибка при обновлении специальности"
+    )
 
 @router.delete("/speciality/{speciality_id}")
 async def speciality_delete(
@@ -395,25 +246,7 @@ async def speciality_delete(
     """
     Удаление специальности
     """
-    result = await db.execute(select(Speciality).where(Speciality.id == speciality_id))
-    speciality = result.scalar_one_or_none()
-
-    if not speciality:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Специальность не найдена"
-        )
-    
-    try:
-        await db.delete(speciality)
-        await db.commit()
-    except Exception:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Ошибка при удалении специальности"
-        )
-    
-    return speciality
+    return await delete_row(db, ENTITIES["speciality"], speciality_id, "Ошибка при удалении специальности")
 
 @router.post("/achievements")
 async def achive_create(
@@ -424,27 +257,11 @@ async def achive_create(
     """
     Создание нового достижения
     """
-    result = await db.execute(select(Achievement).where(Achievement.title == achive_data.title))
-
-    if result.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Достижение с таким заголовком уже существует"
-        )
-    achive = Achievement(**achive_data.model_dump())
-
-    try:
-        db.add(achive)
-        await db.commit()
-        await db.refresh(achive)
-    except IntegrityError:
-        await db.rollback()
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Проблема с созданием достижения"
-        )
-    
-    return achive
+    return await create_row(
+        db, ENTITIES["achievements"], achive_data.model_dump(),
+        duplicate_detail="Достижение с таким заголовком уже существует",
+        error_detail="Проблема с созданием достижения"
+    )
 
 @router.put("/achievements/{achive_id}")
 async def achive_update(
@@ -456,44 +273,11 @@ async def achive_update(
     """
     Обновление достижения
     """
-    result = await db.execute(select(Achievement).where(Achievement.id == achive_id))
-    achive = result.scalar_one_or_none()
-    
-    if not achive:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Достижение не найдено"
-        )
-    
-    update_data = achive_data.model_dump(exclude_unset=True)
-    
-    if "title" in update_data:
-        result = await db.execute(
-            select(Achievement).where(
-                Achievement.title == update_data["title"],
-                Achievement.id != achive_id
-            )
-        )
-        if result.scalar_one_or_none():
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Достижение с таким названием уже существует"
-            )
-    
-    for field, value in update_data.items():
-        setattr(achive, field, value)
-    
-    try:
-        await db.commit()
-        await db.refresh(achive)
-    except IntegrityError:
-        await db.rollback()
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Ошибка при обновлении достижения"
-        )
-    
-    return achive
+    return await update_row(
+        db, ENTITIES["achievements"], achive_id, achive_data.model_dump(exclude_unset=True),
+        duplicate_detail="Достижение с таким названием уже существует",
+        error_detail="Ошибка при обновлении достижения"
+    )
 
 @router.delete("/achievements/{achive_id}")
 async def achive_delete(
@@ -504,26 +288,7 @@ async def achive_delete(
     """
     Удаление достижения
     """
-    result = await db.execute(select(Achievement).where(Achievement.id == achive_id))
-    achive = result.scalar_one_or_none()
-
-    if not achive:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Достижение не найдено"
-        )
-    
-    try:
-        await db.delete(achive)
-        await db.commit()
-    except Exception:
-        db.rollback()
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Ошибка при удалении достижения"
-        )
-    
-    return achive
+    return await delete_row(db, ENTITIES["achievements"], achive_id, "Ошибка при удалении достижения")
 
 @router.post("/directions")
 async def direction_create(
@@ -534,32 +299,12 @@ async def direction_create(
     """
     Создание нового направления
     """
-    result = await db.execute(
-        select(Direction).where(Direction.name == direction_data.name)
+    return await create_row(
+        db, ENTITIES["directions"], direction_data.model_dump(),
+        duplicate_detail="Направление с таким названием уже существует",
+        error_detail="Ошибка при создании направления"
     )
 
-    if result.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Направление с таким названием уже существует"
-        )
-    
-    direction = Direction(**direction_data.model_dump())
-
-    try:
-        db.add(direction)
-        await db.commit()
-        await db.refresh(direction)
-    except IntegrityError:
-        await db.rollback()
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Ошибка при создании направления"
-        )
-    
-    return direction
-
-
 @router.put("/directions/{direction_id}")
 async def direction_update(
     direction_id: int,
@@ -570,46 +315,11 @@ async def direction_update(
     """
     Обновление направления
     """
-    result = await db.execute(
-        select(Direction).where(Direction.id == direction_id)
+    return await update_row(
+        db, ENTITIES["directions"], direction_id, direction_data.model_dump(exclude_unset=True),
+        duplicate_detail="Направление с таким названием уже существует",
+        error_detail="Ошибка при обновлении направления"
     )
-    direction = result.scalar_one_or_none()
-    
-    if not direction:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Направление не найдено"
-        )
-    
-    update_data = direction_data.model_dump(exclude_unset=True)
-    
-    if "name" in update_data:
-        result = await db.execute(
-            select(Direction).where(
-                Direction.name == update_data["name"],
-                Direction.id != direction_id
-            )
-        )
-        if result.scalar_one_or_none():
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Направление с таким названием уже существует"
-            )
-    
-    for field, value in update_data.items():
-        setattr(direction, field, value)
-    
-    try:
-        await db.commit()
-        await db.refresh(direction)
-    except IntegrityError:
-        await db.rollback()
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Ошибка при обновлении направления"
-        )
-    
-    return direction
 
 @router.delete("/directions/{direction_id}")
 async def direction_delete(
@@ -620,36 +330,20 @@ async def direction_delete(
     """
     Удаление направления (с каскадным удалением дисциплин)
     """
-    result = await db.execute(
-        select(Direction).where(Direction.id == direction_id)
+    # Подзапрос в RETURNING видит таблицу до каскадного удаления
+    discipline_count = (
+        select(func.count(Discipline.id))
+        .where(Discipline.direction_id == direction_id)
+        .scalar_subquery()
+        .label("deleted_disciplines_count")
     )
-    direction = result.scalar_one_or_none()
-
-    if not direction:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Направление не найдено"
-        )
-    result = await db.execute(
-        select(func.count(Discipline.id)).where(Discipline.direction_id == direction_id)
+    row = await delete_row(
+        db, ENTITIES["directions"], direction_id, "Ошибка при удалении направления", discipline_count
     )
-    discipline_count = result.scalar()
-    
-    try:
-        await db.delete(direction)
-        await db.commit()
-        return {
-            "message": "Направление успешно удалено",
-            "deleted_disciplines_count": discipline_count
-        }
-        
-    except Exception as e:
-        await db.rollback()
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Ошибка при удалении направления: {str(e)}"
-        )
-
+    return {
+        "message": "Направление успешно удалено",
+        "deleted_disciplines_count": row["deleted_disciplines_count"]
+    }
 
 @router.post("/disciplines")
 async def discipline_create(
@@ -660,49 +354,12 @@ async def discipline_create(
     """
     Создание новой дисциплины
     """
-    result = await db.execute(
-        select(Discipline).where(Discipline.name == discipline_data.name)
+    return await create_row(
+        db, ENTITIES["disciplines"], discipline_data.model_dump(),
+        duplicate_detail="Дисциплина с таким названием уже есть в направлении",
+        error_detail="Ошибка при создании дисциплины"
     )
 
-    if result.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Дисциплина с таким названием уже существует"
-        )
-
-    result = await db.execute(
-        select(Direction).where(Direction.id == discipline_data.direction_id)
-    )
-    direction = result.scalar_one_or_none()
-    
-    if not direction:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Указанное направление не существует"
-        )
-    
-    if discipline_data.start_term > discipline_data.end_term:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Начальный семестр не может быть больше конечного"
-        )
-    
-    discipline = Discipline(**discipline_data.model_dump())
-
-    try:
-        db.add(discipline)
-        await db.commit()
-        await db.refresh(discipline)
-        await db.refresh(direction)
-    except IntegrityError:
-        await db.rollback()
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Ошибка при создании дисциплины"
-        )
-    
-    return discipline
-
 @router.put("/disciplines/{discipline_id}")
 async def discipline_update(
     discipline_id: int,
@@ -713,66 +370,11 @@ async def discipline_update(
     """
     Обновление дисциплины
     """
-    result = await db.execute(
-        select(Discipline).where(Discipline.id == discipline_id)
+    return await update_row(
+        db, ENTITIES["disciplines"], discipline_id, discipline_data.model_dump(exclude_unset=True),
+        duplicate_detail="Дисциплина с таким названием уже есть в направлении",
+        error_detail="Ошибка при обновлении дисциплины"
     )
-    discipline = result.scalar_one_or_none()
-    
-    if not discipline:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Дисциплина не найдена"
-        )
-    
-    update_data = discipline_data.model_dump(exclude_unset=True)
-
-    if "name" in update_data:
-        result = await db.execute(
-            select(Discipline).where(
-                Discipline.name == update_data["name"],
-                Discipline.id != discipline_id
-            )
-        )
-        if result.scalar_one_or_none():
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Дисциплина с таким названием уже существует"
-            )
-
-    if "direction_id" in update_data:
-        result = await db.execute(
-            select(Direction).where(Direction.id == update_data["direction_id"])
-        )
-        if not result.scalar_one_or_none():
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Указанное направление не существует"
-            )
-        
-    start_term = update_data.get("start_term", discipline.start_term)
-    end_term = update_data.get("end_term", discipline.end_term)
-    
-    if start_term > end_term:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Начальный семестр не может быть больше конечного"
-        )
-    
-    for field, value in update_data.items():
-        setattr(discipline, field, value)
-    
-    try:
-        await db.commit()
-        await db.refresh(discipline)
-    except IntegrityError:
-        await db.rollback()
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Ошибка при обновлении дисциплины"
-        )
-    
-    return discipline
-
 
 @router.delete("/disciplines/{discipline_id}")
 async def discipline_delete(
@@ -783,31 +385,7 @@ async def discipline_delete(
     """
     Удаление дисциплины
     """
-    result = await db.execute(
-        select(Discipline).where(Discipline.id == discipline_id)
-    )
-    discipline = result.scalar_one_or_none()
-
-    if not discipline:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Дисциплина не найдена"
-        )
-    
-    try:
-        await db.delete(discipline)
-        await db.commit()
-    except Exception as e:
-        await db.rollback()
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Ошибка при удалении дисциплины: {str(e)}"
-        )
-    
-    return discipline
-
-
-
+    return await delete_row(db, ENTITIES["disciplines"], discipline_id, "Ошибка при удалении дисциплины")
 
 @router.post("/teacher")
 async def teacher_create(
@@ -818,28 +396,12 @@ async def teacher_create(
     """
     Создание нового преподавателя.
     """
-    result = await db.execute(select(Teacher).where(Teacher.fio == teacher_data.fio))
-    if result.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Преподаватель с таким ФИО уже существует"
-        )
-    
-    teacher = (Teacher(**teacher_data.model_dump()))
+    return await create_row(
+        db, ENTITIES["teacher"], teacher_data.model_dump(),
+        duplicate_detail="Преподаватель с таким ФИО уже существует",
+        error_detail="Ошибка при создании преподавателя"
+    )
 
-    try:
-        db.add(teacher)
-        await db.commit()
-        await db.refresh(teacher)
-    except IntegrityError:
-        await db.rollback()
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Ошибка при создании преподавателя"
-        )
-    
-    return teacher
-    
 @router.put("/teacher/{teacher_id}")
 async def teacher_update(
     teacher_id: int,
@@ -850,44 +412,11 @@ async def teacher_update(
     """
     Обновление данных о преподавателе.
     """
-    result = await db.execute(select(Teacher).where(Teacher.id == teacher_id))
-    teacher = result.scalar_one_or_none()
-
-    if not teacher:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Преподаватель не найден"
-        )
-    
-    update_data = teacher_data.model_dump(exclude_unset=True)
-    
-    if "fio" in update_data:
-        result = await db.execute(
-            select(Teacher).where(
-                Teacher.fio == update_data["fio"],
-                Teacher.id != teacher_id
-            )
-        )
-        if result.scalar_one_or_none():
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Преподаватель уже существует"
-            )
-    
-    for field, value in update_data.items():
-        setattr(teacher, field, value)
-    
-    try:
-        await db.commit()
-        await db.refresh(teacher)
-    except IntegrityError:
-        await db.rollback()
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Ошибка при обновлении данных"
-        )
-    
-    return teacher
+    return await update_row(
+        db, ENTITIES["teacher"], teacher_id, teacher_data.model_dump(exclude_unset=True),
+        duplicate_detail="Преподаватель уже существует",
+        error_detail="Ошибка при обновлении данных"
+    )
 
 @router.delete("/teacher/{teacher_id}")
 async def teacher_delete(
@@ -898,22 +427,29 @@ async def teacher_delete(
     """
     Удаление преподавателя.
     """
-    result = await db.execute(select(Teacher).where(Teacher.id == teacher_id))
-    teacher = result.scalar_one_or_none()
+    return await delete_row(db, ENTITIES["teacher"], teacher_id, "Ошибка при удалении")
 
-    if not teacher:
+@router.post("/{entity}/batch", response_model=BatchResult)
+async def batch_write(
+    entity: str,
+    batch: BatchRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user_id: int = Depends(get_current_user)
+):
+    """
+    Пакет операций create/update/delete над одним разделом в одной транзакции.
+    Если хоть одна операция не прошла проверку, не записывается ничего (400),
+    в ответе — результат по каждой операции.
+    """
+    cms_entity = ENTITIES.get(entity)
+    if cms_entity is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="Преподаватель не найден"
-        )
-    
-    try:
-        await db.delete(teacher)
-        await db.commit()
-    except IntegrityError:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Ошибка при удалении"
+            detail="Неизвестный раздел"
         )
-    
-    return teacher
\ No newline at end of file
+
+    result = await run_batch(db, cms_entity, batch.operations)
+    if not result.committed:
+        return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content=result.model_dump())
+    return result
+
@@ -0,0 +1,38 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.health import db_probe, pools
+from app.schemas.health_check import HealthCheck, Liveness
+from app.security import password_hasher
+
+router = APIRouter(tags=["Health"])
+
+@router.get("/livez", response_model=Liveness)
+async def liveness():
+    """
+    Процесс жив и обслуживает event loop. БД не трогаем: задержка проверки БД —
+    из последнего результата фоновой пробы, на статус она не влияет.
+    """
+    return {
+        "status": "ok",
+        "pool": pools(),
+        "password_hasher": password_hasher.stats(),
+        "db_probe": db_probe.timing(),
+    }
+
+@router.get("/readyz", response_model=HealthCheck, responses={503: {"model": HealthCheck}})
+async def readiness():
+    """
+    Готовность принимать трафик: последний результат фоновой проверки БД.
+    """
+    body = {**db_probe.status(), "pool": pools()}
+    if not body["db_status"]:
+        return JSONResponse(status_code=503, content=body)
+    return body
+
+@router.get("/api/health", response_model=HealthCheck, responses={503: {"model": HealthCheck}})
+async def health_check():
+    """
+    Старый адрес проверки, оставлен для совместимости — то же, что /readyz.
+    """
+    return await readiness()
@@ -0,0 +1,42 @@
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import FileResponse
+
+from app.http_cache import IMMUTABLE
+from app.images import ALLOWED_SIZES, UnreadableImage, variant_cache, _NAME_RE
+
+router = APIRouter(prefix="/media", tags=["Media"])
+
+@router.get("/{width}x{height}/{name}", include_in_schema=False)
+async def media_variant(width: int, height: int, name: str):
+    """
+    Уменьшенная WebP-копия загруженного изображения.
+    """
+    if (width, height) not in ALLOWED_SIZES:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Недопустимый размер"
+        )
+    if not _NAME_RE.match(name):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Изображение не найдено"
+        )
+
+    try:
+        path = await variant_cache.get(name, (width, height))
+    except UnreadableImage:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Не удалось обработать изображение"
+        )
+    except OSError:
+        # Обрезанный файл или исходник пропал во время ресайза
+        path = None
+
+    if path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Изображение не найдено"
+        )
+
+    return FileResponse(path, media_type="image/webp", headers={"Cache-Control": IMMUTABLE})
@@ -1,16 +1,20 @@
-from fastapi import APIRouter, Depends
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy.dialects.postgresql import Range
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
-from sqlalchemy.future import select
-from app.database import get_db
-from sqlalchemy.orm import selectinload
-from typing import List
+from app.catalog import catalog, subject_key
+from app.config import settings
+from app.database import get_read_db, read_session
+from app.http_cache import cached_response
+from app.pagination import MAX_PAGE_SIZE, keyset_page, page_response
+from app.search import build_search_query
+from app.streaming import MEDIA_TYPES, stream_collection
+from typing import List, Optional, Union
 import os
 
 from app.models.speciality import Speciality
 from app.models.feature import Feature
-from app.models.plan import Direction, Discipline
+from app.models.plan import Discipline
 from app.models.teacher import Teacher
 from app.models.subject import Subject
 from app.models.achievement import Achievement
@@ -20,14 +24,18 @@ from app.schemas.feature import Feature as FeatureSchema
 from app.schemas.teacher import Teacher as TeacherSchema
 from app.schemas.subject import Subject as SubjectSchema
 from app.schemas.achievement import Achievement as AchievementSchema
+from app.schemas.plan import Discipline as DisciplineSchema
+from app.schemas.search import SearchHit, SearchResult
+from app.schemas.page import Page
 
 router = APIRouter(tags=["Landing"])
 
 @router.get("/") 
-async def read_root():
-
-    file_path = os.path.join("app", "templates", "index.html")
-    return FileResponse(file_path)
+async def read_root(request: Request):
+    """
+    Главная страница, отрендеренная на сервере; кэшируется до следующего изменения в CMS.
+    """
+    return await cached_response(request, catalog, "page", media_type="text/html; charset=utf-8")
 
 @router.get("/robots.txt", include_in_schema=False)
 async def robots():
@@ -37,60 +45,200 @@ async def robots():
 async def sitemap():
     return FileResponse(os.path.join("app", "static", "sitemap.xml"))
 
-@router.get("/api/health")
-async def health_check(db: AsyncSession = Depends(get_db)):
-    try:
-        result = await db.execute(text("SELECT 100 + 55"))
-        value = result.scalar()
-        return {"db_status": True, "math_result": value}
-    except Exception as e:
-        print(f"DB Error: {e}")
-        return {"db_status": False, "error": str(e)}
-
-
-@router.get("/achievements", response_model=List[AchievementSchema])
-async def get_all_achievements(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Achievement).order_by(Achievement.id))
-    return result.scalars().all()
-
-@router.get("/features", response_model=List[FeatureSchema])
-async def get_all_features(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Feature).order_by(Feature.id))
-
-    return result.scalars().all()
+@router.get("/api/landing")
+async def get_landing(request: Request):
+    """
+    Все коллекции лендинга одним ответом.
+    """
+    return await cached_response(request, catalog, "landing")
+
+@router.get("/api/search", response_model=SearchResult)
+async def search(
+    q: str = Query(..., min_length=2, max_length=200),
+    limit: int = Query(20, ge=1, le=50),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Полнотекстовый поиск (русская морфология) по дисциплинам, преподавателям,
+    предметам и достижениям. Синтаксис как у поисковиков: "фраза", -слово, OR.
+    """
+    result = await db.execute(build_search_query(limit), {"q": q})
+    items = [SearchHit(**row) for row in result.mappings()]
+    return page_response(SearchResult(query=q, items=items).model_dump(), "search")
+
+def _paginated(after, limit, *filters) -> bool:
+    # Без параметров — прежний полный список из кэша (его ждет текущий фронтенд).
+    # Сессию БД такие ручки открывают сами и только для страницы, не через Depends
+    return after is not None or limit is not None or any(f is not None for f in filters)
+
+@router.get("/api/roadmap")
+async def get_roadmap(request: Request):
+    """
+    Готовая раскладка дорожной карты по направлениям (группы -> строки -> дисциплины).
+    """
+    return await cached_response(request, catalog, "roadmap")
+
+@router.get("/achievements", response_model=Union[List[AchievementSchema], Page[AchievementSchema]])
+async def get_all_achievements(
+    request: Request,
+    after: Optional[str] = Query(None, description="Курсор из поля next предыдущей страницы"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    theme: Optional[str] = Query(None, max_length=225)
+):
+    """
+    Достижения. С after/limit/theme — страница {"items", "next"}.
+    """
+    if not _paginated(after, limit, theme):
+        return await cached_response(request, catalog, "achievements")
+    filters = [Achievement.theme == theme] if theme is not None else []
+    async with read_session() as db:
+        page = await keyset_page(db, Achievement, AchievementSchema, Achievement.id, after, limit, *filters)
+    return page_response(page, "achievements")
+
+@router.get("/features", response_model=Union[List[FeatureSchema], Page[FeatureSchema]])
+async def get_all_features(
+    request: Request,
+    after: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE)
+):
+    if not _paginated(after, limit):
+        return await cached_response(request, catalog, "features")
+    async with read_session() as db:
+        page = await keyset_page(db, Feature, FeatureSchema, Feature.id, after, limit)
+    return page_response(page, "features")
 
 @router.get("/directions-with-disciplines")
-async def get_all_directions_with_disciplines(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Direction).options(selectinload(Direction.disciplines)).order_by(Direction.id))
-    directions = result.scalars().all()
-
-    return [{
-        "id": d.id,
-        "name": d.name,
-        "disciplines": [{
-            "id": disc.id,
-            "name": disc.name,
-            "start_term": disc.start_term,
-            "end_term": disc.end_term,
-            "group": disc.group,
-            "direction_id": disc.direction_id
-        } for disc in d.disciplines]
-    } for d in directions]
-
-@router.get("/speciality", response_model=List[SpecialitySchema])
-async def get_all_speciality(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Speciality).order_by(Speciality.id))
-
-    return result.scalars().all()
-
-@router.get("/subjects", response_model=List[SubjectSchema])
-async def get_all_subjects(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Subject).order_by(Subject.id))
-
-    return result.scalars().all()
-
-@router.get("/teachers", response_model=List[TeacherSchema])
-async def get_all_teachers(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Teacher).order_by(Teacher.fio))
-
-    return result.scalars().all()
\ No newline at end of file
+async def get_all_directions_with_disciplines(request: Request):
+    if settings.DIRECTIONS_JSON_IN_DB:
+        return await cached_response(request, catalog, "directions_document", route="directions")
+    return await cached_response(request, catalog, "directions")
+
+@router.get("/disciplines", response_model=Page[DisciplineSchema])
+async def get_disciplines(
+    request: Request,
+    after: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    direction_id: Optional[int] = Query(None, gt=0),
+    group: Optional[str] = Query(None, max_length=100),
+    term: Optional[int] = Query(None, ge=1, le=12, description="Идут в этом семестре"),
+    from_term: Optional[int] = Query(None, ge=1, le=12, description="Пересекаются с семестрами from_term–to_term"),
+    to_term: Optional[int] = Query(None, ge=1, le=12),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Дисциплины всех направлений постранично, с фильтрами по направлению, группе
+    и семестрам. Семестровые фильтры идут по GiST-индексу (direction_id, terms).
+    """
+    filters = []
+    if direction_id is not None:
+        filters.append(Discipline.direction_id == direction_id)
+    if group is not None:
+        filters.append(Discipline.group == group)
+    if term is not None:
+        filters.append(Discipline.terms.contains(term))
+    if from_term is not None or to_term is not None:
+        if from_term is not None and to_term is not None and from_term > to_term:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Начальный семестр не может быть больше конечного"
+            )
+        # Пропущенная граница — открытый диапазон
+        filters.append(Discipline.terms.overlaps(Range(from_term, to_term, bounds="[]")))
+    page = await keyset_page(db, Discipline, DisciplineSchema, Discipline.id, after, limit, *filters)
+    return page_response(page, "disciplines")
+
+@router.get("/speciality", response_model=Union[List[SpecialitySchema], Page[SpecialitySchema]])
+async def get_all_speciality(
+    request: Request,
+    after: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE)
+):
+    if not _paginated(after, limit):
+        return await cached_response(request, catalog, "speciality")
+    async with read_session() as db:
+        page = await keyset_page(db, Speciality, SpecialitySchema, Speciality.id, after, limit)
+    return page_response(page, "speciality")
+
+@router.get("/subjects", response_model=Union[List[SubjectSchema], Page[SubjectSchema]])
+async def get_all_subjects(
+    request: Request,
+    after: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE)
+):
+    if not _paginated(after, limit):
+        return await cached_response(request, catalog, "subjects")
+    async with read_session() as db:
+        page = await keyset_page(db, Subject, SubjectSchema, Subject.id, after, limit)
+    return page_response(page, "subjects")
+
+@router.get("/subjects/{subject_id}/teachers", response_model=List[TeacherSchema])
+async def get_subject_teachers(subject_id: int):
+    """
+    Преподаватели предмета — из обратного индекса в кэше, без запроса к БД.
+    """
+    snapshot = await catalog.get("teachers_by_subject")
+    teachers = snapshot.data.get(str(subject_id))
+    if teachers is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Предмет не найден"
+        )
+    return page_response(teachers, "teachers")
+
+@router.get("/teachers", response_model=Union[List[TeacherSchema], Page[TeacherSchema]])
+async def get_all_teachers(
+    request: Request,
+    after: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    subject: Optional[str] = Query(None, min_length=1, max_length=100)
+):
+    """
+    Преподаватели по ФИО (ФИО уникально, ключ страницы — оно же).
+    subject — название предмета (без учета регистра, как /subjects/{id}/teachers);
+    фильтр идет по GIN-индексу (subjects @> ARRAY[...]).
+    """
+    if not _paginated(after, limit, subject):
+        return await cached_response(request, catalog, "teachers")
+    filters = []
+    if subject is not None:
+        # При записи предметы приводятся к написанию из справочника — запрос тоже
+        subjects = await catalog.get("subjects")
+        canonical = {subject_key(item["name"]): item["name"] for item in subjects.data}
+        filters.append(Teacher.subjects.contains([canonical.get(subject_key(subject), subject.strip())]))
+    async with read_session() as db:
+        page = await keyset_page(db, Teacher, TeacherSchema, Teacher.fio, after, limit, *filters)
+    return page_response(page, "teachers")
+
+# Коллекции для полной выгрузки: модель, схема ответа, порядок
+EXPORTS = {
+    "achievements": (Achievement, AchievementSchema, Achievement.id),
+    "disciplines": (Discipline, DisciplineSchema, Discipline.id),
+    "teachers": (Teacher, TeacherSchema, Teacher.fio),
+    "subjects": (Subject, SubjectSchema, Subject.id),
+}
+
+@router.get("/export/{collection}")
+async def export_collection(
+    collection: str,
+    format: str = Query("json", pattern="^(json|ndjson)$")
+):
+    """
+    Полная выгрузка таблицы потоком (chunked): JSON-массив или NDJSON.
+    Строки читаются серверным курсором, память на запрос не зависит от размера таблицы.
+    """
+    export = EXPORTS.get(collection)
+    if export is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Неизвестная коллекция"
+        )
+    model, schema, order_by = export
+    return StreamingResponse(
+        stream_collection(model, schema, order_by, format),
+        media_type=MEDIA_TYPES[format],
+        headers={
+            "Cache-Control": settings.cache_control("export"),
+            "Content-Disposition": f'attachment; filename="{collection}.{format}"',
+        },
+    )
+
@@ -8,7 +8,10 @@ from .user import (UserBase, User)
 from .auth import (Token, TokenData, LoginRequest)
 from .achievement import (AchievementBase, AchievementCreate, AchievementUpdate, Achievement)
 
-from .health_check import HealthCheck
+from .health_check import HealthCheck, Liveness, PoolStats, PasswordHasherStats
+from .media import MediaReference, MediaBlob, MediaPruneResult
+from .batch import BatchOperation, BatchRequest, BatchItemResult, BatchResult
+from .search import SearchHit, SearchResult
 
 __all__ = [
     # Feature
@@ -39,5 +42,14 @@ __all__ = [
     'AchievementBase', 'AchievementCreate', 'AchievementUpdate', 'Achievement',
 
     # Health Check
-    'HealthCheck',
+    'HealthCheck', 'Liveness', 'PoolStats', 'PasswordHasherStats',
+
+    # Media
+    'MediaReference', 'MediaBlob', 'MediaPruneResult',
+
+    # Batch
+    'BatchOperation', 'BatchRequest', 'BatchItemResult', 'BatchResult',
+
+    # Search
+    'SearchHit', 'SearchResult',
 ]
\ No newline at end of file
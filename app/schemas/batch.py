@@ -0,0 +1,22 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Literal, Optional
+
+class BatchOperation(BaseModel):
+    op: Literal["create", "update", "delete"]
+    id: Optional[int] = Field(None, gt=0)
+    data: Optional[Dict[str, Any]] = None
+
+class BatchRequest(BaseModel):
+    operations: List[BatchOperation] = Field(..., min_length=1, max_length=1000)
+
+class BatchItemResult(BaseModel):
+    index: int
+    op: str
+    id: Optional[int] = None
+    status: Optional[Literal["created", "updated", "deleted"]] = None
+    error: Optional[str] = None
+
+class BatchResult(BaseModel):
+    committed: bool
+    error: Optional[str] = None
+    results: List[BatchItemResult]
@@ -1,6 +1,35 @@
 from pydantic import BaseModel
+from typing import Dict, Optional
+
+class PoolStats(BaseModel):
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    max_overflow: int
+
+class PasswordHasherStats(BaseModel):
+    workers: int
+    in_flight: int
+    max_pending: int
+    completed: int
+    failed: int = 0
+    rejected: int
+    avg_latency_ms: Optional[float] = None
+
+class ProbeTiming(BaseModel):
+    latency_ms: Optional[float] = None
+    checked_ago_s: Optional[float] = None
+
+class Liveness(BaseModel):
+    status: str = "ok"
+    pool: Dict[str, PoolStats]
+    password_hasher: PasswordHasherStats
+    db_probe: ProbeTiming
 
 class HealthCheck(BaseModel):
     db_status: bool
-    math_result: int | None = None
     error: str | None = None
+    latency_ms: float | None = None
+    checked_ago_s: float | None = None
+    pool: Dict[str, PoolStats]
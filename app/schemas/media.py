@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from typing import List
+
+class MediaReference(BaseModel):
+    table: str
+    column: str
+    id: int
+
+class MediaBlob(BaseModel):
+    name: str
+    url: str
+    size: int
+    references: List[MediaReference]
+
+class MediaPruneResult(BaseModel):
+    removed: List[str]
+    freed_bytes: int
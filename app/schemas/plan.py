@@ -1,4 +1,4 @@
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 from typing import Optional, List
 
 class DirectionBase(BaseModel):
@@ -23,7 +23,11 @@ class DisciplineBase(BaseModel):
     direction_id: int = Field(..., gt=0)
 
 class DisciplineCreate(DisciplineBase):
-    pass
+    @model_validator(mode="after")
+    def check_terms(self):
+        if self.start_term > self.end_term:
+            raise ValueError("Начальный семестр не может быть больше конечного")
+        return self
 
 class DisciplineUpdate(BaseModel):
     name: Optional[str] = Field(None, min_length=1, max_length=200)
@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+class SearchHit(BaseModel):
+    kind: str
+    id: int
+    title: str
+    subtitle: Optional[str] = None
+    rank: float
+
+class SearchResult(BaseModel):
+    query: str
+    items: List[SearchHit]
@@ -0,0 +1,47 @@
+from sqlalchemy import Float, String, bindparam, func, literal, literal_column, select, union_all
+
+from app.models.plan import Discipline
+from app.models.teacher import Teacher
+from app.models.subject import Subject
+from app.models.achievement import Achievement
+
+# Та же конфигурация, что в вычисляемых колонках search_vector моделей
+SEARCH_CONFIG = "russian"
+
+
+# (вид, модель, заголовок, подзаголовок)
+SEARCH_TARGETS = (
+    ("discipline", Discipline, Discipline.name, Discipline.group),
+    ("teacher", Teacher, Teacher.fio, Teacher.post),
+    ("subject", Subject, Subject.name, Subject.description),
+    ("achievement", Achievement, Achievement.title, Achievement.theme),
+)
+
+
+def build_search_query(limit: int):
+    """
+    UNION ALL по таблицам: в каждой ветке совпадения ищутся по GIN-индексу
+    и ранжируются ts_rank, лучшие limit строк каждой ветки сливаются и сортируются еще раз.
+    Фильтр и ранг считаются по хранимой колонке search_vector: ts_rank не пересчитывает
+    to_tsvector для каждой найденной строки.
+    Текст запроса — параметр :q, разбирается websearch_to_tsquery (кавычки, минус, OR).
+    """
+    query = func.websearch_to_tsquery(literal_column(f"'{SEARCH_CONFIG}'"), bindparam("q", type_=String))
+    branches = []
+    for kind, model, title, subtitle in SEARCH_TARGETS:
+        vector = model.search_vector
+        rank = func.ts_rank(vector, query, type_=Float)
+        branches.append(
+            select(
+                literal(kind, String).label("kind"),
+                model.id.label("id"),
+                title.label("title"),
+                subtitle.label("subtitle"),
+                rank.label("rank"),
+            )
+            .where(vector.op("@@")(query))
+            .order_by(rank.desc())
+            .limit(limit)
+        )
+    hits = union_all(*branches).subquery("hits")
+    return select(hits).order_by(hits.c.rank.desc(), hits.c.kind, hits.c.id).limit(limit)
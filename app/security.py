@@ -1,5 +1,11 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import bcrypt
 
+from app.config import settings
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Проверяет, соответствует ли обычный пароль хешированному
@@ -24,4 +30,86 @@ def get_password_hash(password: str) -> str:
     salt = bcrypt.gensalt()
     hashed = bcrypt.hashpw(password_bytes, salt)
     
-    return hashed.decode('utf-8')
\ No newline at end of file
+    return hashed.decode('utf-8')
+
+
+class PasswordServiceBusy(Exception):
+    """
+    Очередь на bcrypt переполнена — запрос нужно отклонить, не начиная хеширование.
+    """
+
+
+class PasswordHasher:
+    """
+    bcrypt в отдельном пуле потоков, чтобы не блокировать event loop.
+
+    bcrypt отпускает GIL, поэтому потоки работают параллельно на разных ядрах.
+    Одновременно выполняется не больше workers операций, ждать в очереди могут
+    еще max_pending; сверх этого — PasswordServiceBusy (наружу — быстрый 429).
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.latency_seconds = 0.0
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def _run(self, func, *args):
+        if self._in_flight >= self.workers + self.max_pending:
+            self.rejected += 1
+            raise PasswordServiceBusy()
+
+        self._in_flight += 1
+        started = time.monotonic()
+        loop = asyncio.get_running_loop()
+        future = self._executor.submit(func, *args)
+        # Место освобождается, когда задача закончилась в пуле, а не когда ушел вызывающий:
+        # отмененный запрос не отменяет уже начатый bcrypt, и он должен учитываться в лимите
+        future.add_done_callback(lambda done: self._call_on_loop(loop, self._finish, done, started))
+        return await asyncio.wrap_future(future)
+
+    @staticmethod
+    def _call_on_loop(loop, callback, *args) -> None:
+        # done_callback вызывается в потоке пула; счетчики меняем только из event loop
+        try:
+            loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            # Цикл уже закрыт (остановка процесса)
+            pass
+
+    def _finish(self, future, started: float) -> None:
+        self._in_flight -= 1
+        if future.cancelled() or future.exception() is not None:
+            # Ошибки и отмены не попадают в completed и среднюю задержку
+            self.failed += 1
+        else:
+            self.completed += 1
+            self.latency_seconds += time.monotonic() - started
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(get_password_hash, password)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "in_flight": self._in_flight,
+            "max_pending": self.max_pending,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "avg_latency_ms": round(self.latency_seconds / self.completed * 1000, 2) if self.completed else None,
+        }
+
+
+password_hasher = PasswordHasher(settings.BCRYPT_WORKERS, settings.BCRYPT_MAX_PENDING)
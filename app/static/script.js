@@ -47,22 +47,18 @@
   // ================= 2. FETCH DATA =================
   async function loadData() {
     try {
-      // Запрашиваем все данные параллельно
-      const [specialities, subjects, features, teachers, achievements, directions] = await Promise.all([
-        fetch('/speciality').then(r => r.json()),
-        fetch('/subjects').then(r => r.json()),
-        fetch('/features').then(r => r.json()),
-        fetch('/teachers').then(r => r.json()),
-        fetch('/achievements').then(r => r.json()),
-        fetch('/directions-with-disciplines').then(r => r.json())
-      ]);
+      // Данные встроены сервером в страницу; запрос — только если острова нет
+      const island = getById('landing-data');
+      const { specialities, subjects, features, teachers, achievements, roadmap } = island
+        ? JSON.parse(island.textContent)
+        : await fetch('/api/landing').then(r => r.json());
 
       renderSpecialities(specialities);
       renderSubjects(subjects);
       renderFeatures(features);
       renderTeachers(teachers);
       renderAchievements(achievements);
-      initRoadmap(directions);
+      initRoadmap(roadmap);
 
       initObservers();
 
@@ -147,6 +143,12 @@
     `}).join('');
   }
   // --- Преподаватели (Teachers) ---
+  // Загруженные фото берем уменьшенными (/media/360x360/..., 720x720 для retina)
+  function teacherPhotoAttrs(url) {
+    const m = /^\/media\/([A-Za-z0-9_-]+\.(?:jpg|jpeg|png|webp))$/.exec(url);
+    if (!m) return `src="${esc(url)}"`;
+    return `src="/media/360x360/${m[1]}" srcset="/media/360x360/${m[1]} 1x, /media/720x720/${m[1]} 2x"`;
+  }
   function renderTeachers(data) {
     const fTrack = getById('facultyTrack');
     if (!fTrack) return;
@@ -154,7 +156,7 @@
     const innerHtml = data.map(t => {
 
       const imgBlock = t.image_url 
-        ? `<img src="${esc(t.image_url)}" alt="${esc(t.fio)}" style="width:100%; height:100%; object-fit:cover; object-position: top center;">` 
+        ? `<img ${teacherPhotoAttrs(t.image_url)} alt="${esc(t.fio)}" loading="lazy" style="width:100%; height:100%; object-fit:cover; object-position: top center;">` 
         : `<div style="width:100%; height:100%; background:#ddd; display:flex; align-items:center; justify-content:center; color:#777;">Нет фото</div>`;
 
       return `
@@ -191,89 +193,40 @@
   }
 
 
-  function initRoadmap(directionsData) {
+  function initRoadmap(roadmap) {
     const rSelect = getById('roadmapSelect');
     const rGrid = getById('roadmap-grid');
     const rTip = getById('course-tooltip');
     
-    if (!rGrid || !directionsData.length) return;
+    if (!rGrid || !roadmap.length) return;
 
     // Заполняем Select
-    rSelect.innerHTML = directionsData.map((d, i) => 
+    rSelect.innerHTML = roadmap.map((d, i) => 
         `<option value="${i}">${esc(d.name)}</option>`
     ).join('');
 
-    // --- Алгоритм упаковки предметов в строки ---
-    const packDisciplines = (disciplines) => {
-
-        const sorted = [...disciplines].sort((a, b) => {
-            if (a.start_term !== b.start_term) return a.start_term - b.start_term;
-            return (b.end_term - b.start_term) - (a.end_term - a.start_term);
-        });
-
-        const lanes = []; 
-
-        sorted.forEach(disc => {
-            let placed = false;
-
-            for (let lane of lanes) {
-                const lastItem = lane[lane.length - 1];
-
-                if (disc.start_term > lastItem.end_term) {
-                    lane.push(disc);
-                    placed = true;
-                    break;
-                }
-            }
-
-            if (!placed) lanes.push([disc]);
-        });
-        return lanes;
-    };
-
-    // Функция отрисовки
+    // Функция отрисовки. Группы и строки уже разложены сервером (/api/roadmap)
     const drawGrid = (directionIndex) => {
-        const direction = directionsData[directionIndex];
-        const allDisciplines = direction.disciplines || [];
-
-
-        const groups = {};
-        allDisciplines.forEach(d => {
-            const gName = d.group || "Общие";
-            if (!groups[gName]) groups[gName] = [];
-            groups[gName].push(d);
-        });
-
-
-        const groupNames = Object.keys(groups).sort((a, b) => {
-            if(a === "Общие") return -1;
-            if(b === "Общие") return 1;
-            return a.localeCompare(b);
-        });
-
+        const direction = roadmap[directionIndex];
         let html = '';
 
-        groupNames.forEach((gName, gIndex) => {
-            const groupDisciplines = groups[gName];
-            const packedLanes = packDisciplines(groupDisciplines);
+        direction.groups.forEach((group, gIndex) => {
+            const gName = group.name;
             const colorClass = getColor(gIndex);
 
-
-            const rowsHtml = packedLanes.map(lane => {
+            const rowsHtml = group.lanes.map(lane => {
                 let cellsHtml = '';
                 let currentTerm = 1;
 
                 lane.forEach(disc => {
 
-                    if (disc.start_term > currentTerm) {
-                        const emptySpan = disc.start_term - currentTerm;
-                        cellsHtml += `<div class="roadmap-cell inactive" style="grid-column: span ${emptySpan};"></div>`;
+                    if (disc.gap > 0) {
+                        cellsHtml += `<div class="roadmap-cell inactive" style="grid-column: span ${disc.gap};"></div>`;
                     }
 
-                    const duration = disc.end_term - disc.start_term + 1;
                     cellsHtml += `
                         <div class="roadmap-cell active ${colorClass} start end" 
-                             style="grid-column: span ${duration};"
+                             style="grid-column: span ${disc.span};"
                              data-desc="${esc(gName)} | Семестры: ${disc.start_term}-${disc.end_term}" 
                              data-name="${esc(disc.name)}">
                              <span class="roadmap-cell-text">${esc(disc.name)}</span>
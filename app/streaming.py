@@ -0,0 +1,44 @@
+from typing import AsyncIterator, Type
+
+import orjson
+from pydantic import BaseModel
+from sqlalchemy import select
+
+from app.database import read_session
+
+# Сколько строк забирать с серверного курсора за раз и отдавать одним куском
+STREAM_BATCH_SIZE = 500
+
+MEDIA_TYPES = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+}
+
+
+async def stream_collection(model, schema: Type[BaseModel], order_by, fmt: str = "json") -> AsyncIterator[bytes]:
+    """
+    Выгружает таблицу кусками по мере чтения с серверного курсора: JSON-массив или NDJSON.
+    В памяти одновременно не больше STREAM_BATCH_SIZE строк, сколько бы их ни было в таблице.
+
+    Сессия открывается внутри генератора: StreamingResponse читает его уже после
+    выхода из обработчика, когда сессии из Depends закрыты.
+    """
+    # Берем только поля схемы ответа: без ORM-объектов и без повторной валидации
+    columns = [getattr(model, field) for field in schema.model_fields]
+    query = select(*columns).order_by(order_by).execution_options(yield_per=STREAM_BATCH_SIZE)
+
+    async with read_session() as session:
+        result = await session.stream(query)
+        first = True
+        if fmt == "json":
+            yield b"["
+        async for partition in result.mappings().partitions():
+            rows = [orjson.dumps(dict(row)) for row in partition]
+            if fmt == "ndjson":
+                yield b"\n".join(rows) + b"\n"
+            else:
+                chunk = b",".join(rows)
+                yield chunk if first else b"," + chunk
+            first = False
+        if fmt == "json":
+            yield b"]"
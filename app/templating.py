@@ -0,0 +1,18 @@
+import orjson
+from fastapi.templating import Jinja2Templates
+from markupsafe import Markup
+
+from app.assets import asset_url
+
+templates = Jinja2Templates(directory="app/templates")
+templates.env.globals["asset_url"] = asset_url
+
+
+def json_script(data) -> Markup:
+    """
+    JSON для встраивания в <script type="application/json">.
+    Экранируем символы, которыми можно закрыть тег или сломать HTML-парсер.
+    """
+    text = orjson.dumps(data).decode("utf-8")
+    text = text.replace("<", "\\u003c").replace(">", "\\u003e").replace("&", "\\u0026")
+    return Markup(text)
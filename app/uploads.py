@@ -0,0 +1,259 @@
+import hashlib
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from fastapi.staticfiles import StaticFiles
+from sqlalchemy import select
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, UploadFile
+from starlette.exceptions import HTTPException
+from starlette.responses import JSONResponse
+
+from app.config import settings
+from app.http_cache import IMMUTABLE
+from app.models.teacher import Teacher
+
+UPLOAD_DIR = Path("app/uploads")
+CHUNK_SIZE = 64 * 1024
+
+# Колонки, в которых хранятся ссылки /media/<имя>. Индекс ссылок строится по ним
+MEDIA_REFERENCES = (
+    (Teacher, Teacher.image_url),
+)
+
+# Сигнатуры (magic bytes) поддерживаемых изображений
+_SIGNATURES = (
+    (b"\xff\xd8\xff", "jpg"),
+    (b"\x89PNG\r\n\x1a\n", "png"),
+)
+
+
+class UploadRejected(ValueError):
+    """
+    Файл не принят. status_code — какой HTTP-статус отдать клиенту API.
+    """
+    def __init__(self, detail: str, status_code: int = 400):
+        super().__init__(detail)
+        self.detail = detail
+        self.status_code = status_code
+
+
+def _too_large_detail(max_bytes: int) -> str:
+    return f"Файл больше {max_bytes / (1024 * 1024):g} МБ"
+
+
+class UploadLimitMiddleware:
+    """
+    Ограничивает тело multipart-запросов под /admin (формы sqladmin и /admin/cms/upload).
+
+    save_image проверяет размер, когда Starlette уже принял и сохранил весь файл;
+    здесь слишком большой запрос отклоняется раньше: по Content-Length сразу,
+    без него (chunked) — как только принято больше лимита.
+    """
+
+    def __init__(self, app, prefix: str = "/admin", max_bytes: int = None):
+        self.app = app
+        self.prefix = prefix
+        self.max_upload = max_bytes or settings.UPLOAD_MAX_BYTES
+        # Запас сверх лимита файла — на границы multipart и остальные поля формы
+        self.max_body = self.max_upload + settings.UPLOAD_FORM_OVERHEAD_BYTES
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.prefix):
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        if not headers.get("content-type", "").startswith("multipart/form-data"):
+            await self.app(scope, receive, send)
+            return
+
+        detail = _too_large_detail(self.max_upload)
+        content_length = headers.get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self.max_body:
+            response = JSONResponse({"detail": detail}, status_code=413, headers={"Connection": "close"})
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body:
+                    # HTTPException проходит через разбор формы в FastAPI и sqladmin
+                    # и превращается в ответ 413 их обработчиками исключений
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+def detect_image_type(head: bytes) -> Optional[str]:
+    """
+    Определяет тип изображения по первым байтам файла. Возвращает расширение или None.
+    """
+    for signature, extension in _SIGNATURES:
+        if head.startswith(signature):
+            return extension
+    if len(head) >= 12 and head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    return None
+
+
+def _open_temp():
+    # Временный файл в той же папке, чтобы финальный os.replace был атомарным
+    UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+    fd, path = tempfile.mkstemp(dir=UPLOAD_DIR, prefix=".upload-", suffix=".part")
+    return os.fdopen(fd, "wb"), path
+
+
+def _store(tmp_path: str, target: Path) -> None:
+    if target.exists():
+        # Такой файл уже есть — копию не храним, только освежаем mtime,
+        # чтобы очистка не сочла его давно забытым
+        os.unlink(tmp_path)
+        os.utime(target)
+    else:
+        os.replace(tmp_path, target)
+
+
+def _discard(buffer, path: str) -> None:
+    buffer.close()
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+async def save_image(upload: UploadFile, max_bytes: int = None) -> str:
+    """
+    Потоково сохраняет изображение в app/uploads и возвращает его URL (/media/...).
+
+    Файл читается кусками, запись идет в пуле потоков, размер проверяется по ходу
+    чтения (тело запроса заранее ограничено UploadLimitMiddleware), тип — по сигнатуре, а не по имени или Content-Type от клиента.
+    Имя файла — SHA-256 содержимого: повторная загрузка того же фото не создает копию.
+    """
+    max_bytes = max_bytes or settings.UPLOAD_MAX_BYTES
+    buffer, tmp_path = await run_in_threadpool(_open_temp)
+    digest = hashlib.sha256()
+    head = b""
+    extension = None
+    size = 0
+
+    try:
+        while True:
+            chunk = await upload.read(CHUNK_SIZE)
+            if not chunk:
+                break
+
+            size += len(chunk)
+            if size > max_bytes:
+                raise UploadRejected(_too_large_detail(max_bytes), status_code=413)
+
+            if extension is None:
+                head += chunk[:12]
+                if len(head) >= 12:
+                    extension = detect_image_type(head)
+                    if extension is None:
+                        raise UploadRejected("Только изображения (jpg, png, webp)")
+
+            digest.update(chunk)
+            await run_in_threadpool(buffer.write, chunk)
+
+        if extension is None:
+            extension = detect_image_type(head)
+            if extension is None:
+                raise UploadRejected("Только изображения (jpg, png, webp)")
+
+        await run_in_threadpool(buffer.close)
+        filename = f"{digest.hexdigest()}.{extension}"
+        await run_in_threadpool(_store, tmp_path, UPLOAD_DIR / filename)
+    except BaseException:
+        await run_in_threadpool(_discard, buffer, tmp_path)
+        raise
+
+    return f"/media/{filename}"
+
+
+def media_name(url: Optional[str]) -> Optional[str]:
+    """
+    /media/<имя> -> <имя>; для внешних и пустых ссылок None.
+    """
+    if not url or not url.startswith("/media/"):
+        return None
+    name = url[len("/media/"):]
+    return name if name and "/" not in name else None
+
+
+async def collect_references(session) -> Dict[str, List[dict]]:
+    """
+    Индекс ссылок: имя файла -> строки моделей, которые на него указывают.
+    Строится по данным в БД, поэтому не может разойтись с ними.
+    """
+    references: Dict[str, List[dict]] = {}
+    for model, column in MEDIA_REFERENCES:
+        result = await session.execute(
+            select(model.id, column).where(column.like("/media/%"))
+        )
+        for row_id, url in result.all():
+            name = media_name(url)
+            if name:
+                references.setdefault(name, []).append(
+                    {"table": model.__tablename__, "column": column.key, "id": row_id}
+                )
+    return references
+
+
+def list_blobs() -> Dict[str, os.stat_result]:
+    """
+    Загруженные файлы (без временных и служебных).
+    """
+    UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+    return {
+        entry.name: entry.stat()
+        for entry in os.scandir(UPLOAD_DIR)
+        if entry.is_file() and not entry.name.startswith(".")
+    }
+
+
+def remove_blobs(names: List[str], variant_dir: Path) -> None:
+    """
+    Удаляет файлы вместе с их уменьшенными копиями.
+    """
+    for name in names:
+        stem = name.rsplit(".", 1)[0]
+        paths = [UPLOAD_DIR / name]
+        if variant_dir.is_dir():
+            paths += variant_dir.glob(f"{stem}-*.webp")
+        for path in paths:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+
+def orphaned_blobs(blobs: Dict[str, os.stat_result], references: Dict[str, List[dict]], grace_seconds: int) -> List[str]:
+    """
+    Файлы без ссылок. Свежие не трогаем: загрузка и сохранение строки — разные запросы.
+    """
+    cutoff = time.time() - grace_seconds
+    return sorted(
+        name for name, stat_result in blobs.items()
+        if name not in references and stat_result.st_mtime < cutoff
+    )
+
+
+class MediaStaticFiles(StaticFiles):
+    """
+    /media: имена файлов не переиспользуются под другое содержимое, поэтому кэш бессрочный.
+    """
+
+    def file_response(self, *args, **kwargs):
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = IMMUTABLE
+        return response
@@ -0,0 +1,110 @@
+"""
+Сколько запросов к БД уходит на одну правку в CMS: старая схема
+(SELECT по id, SELECT на дубль, setattr, commit, refresh) против одного
+UPDATE ... RETURNING / INSERT ... ON CONFLICT ... RETURNING.
+
+Нужна запущенная Postgres с примененными миграциями. Скрипт создает
+и удаляет свои строки (предметы с префиксом bench-).
+
+Запуск: SECRET_KEY=... python -m benchmarks.bench_cms_queries
+"""
+import asyncio
+import time
+import uuid
+
+from sqlalchemy import delete, event, select
+
+from app.cms_entities import ENTITIES, create_row, delete_row, update_row
+from app.database import AsyncSessionLocal, engine
+from app.models.subject import Subject
+
+ROUNDS = 50
+
+
+class QueryCounter:
+    def __init__(self):
+        self.queries = 0
+
+    def __call__(self, *args):
+        self.queries += 1
+
+
+async def legacy_create(db, name):
+    result = await db.execute(select(Subject).where(Subject.name == name))
+    result.scalar_one_or_none()
+    subject = Subject(name=name, description="bench")
+    db.add(subject)
+    await db.commit()
+    await db.refresh(subject)
+    return subject.id
+
+
+async def legacy_update(db, subject_id, name):
+    result = await db.execute(select(Subject).where(Subject.id == subject_id))
+    subject = result.scalar_one_or_none()
+    result = await db.execute(select(Subject).where(Subject.name == name, Subject.id != subject_id))
+    result.scalar_one_or_none()
+    subject.name = name
+    await db.commit()
+    await db.refresh(subject)
+
+
+async def legacy_delete(db, subject_id):
+    result = await db.execute(select(Subject).where(Subject.id == subject_id))
+    subject = result.scalar_one_or_none()
+    await db.delete(subject)
+    await db.commit()
+
+
+async def returning_create(db, name):
+    row = await create_row(db, ENTITIES["subject"], {"name": name, "description": "bench"}, "dup", "err")
+    return row["id"]
+
+
+async def returning_update(db, subject_id, name):
+    await update_row(db, ENTITIES["subject"], subject_id, {"name": name}, "dup", "err")
+
+
+async def returning_delete(db, subject_id):
+    await delete_row(db, ENTITIES["subject"], subject_id, "err")
+
+
+async def measure(label, create, update, remove):
+    counter = QueryCounter()
+    # COMMIT тоже сетевой обмен, считаем его наравне с запросами
+    event.listen(engine.sync_engine, "before_cursor_execute", counter)
+    event.listen(engine.sync_engine, "commit", counter)
+    prefix = f"bench-{uuid.uuid4().hex[:8]}"
+    totals = {operation: [0, 0.0] for operation in ("create", "update", "delete")}
+    try:
+        for i in range(ROUNDS):
+            async with AsyncSessionLocal() as db:
+                for operation in ("create", "update", "delete"):
+                    before, started = counter.queries, time.perf_counter()
+                    if operation == "create":
+                        subject_id = await create(db, f"{prefix}-{i}")
+                    elif operation == "update":
+                        await update(db, subject_id, f"{prefix}-{i}-renamed")
+                    else:
+                        await remove(db, subject_id)
+                    totals[operation][0] += counter.queries - before
+                    totals[operation][1] += time.perf_counter() - started
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", counter)
+        event.remove(engine.sync_engine, "commit", counter)
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(Subject).where(Subject.name.like(f"{prefix}%")))
+            await db.commit()
+
+    for operation, (queries, seconds) in totals.items():
+        print(f"{label:>10} {operation:>6}: {queries / ROUNDS:4.1f} запросов, {seconds / ROUNDS * 1000:6.2f} мс")
+
+
+async def main() -> None:
+    await measure("до", legacy_create, legacy_update, legacy_delete)
+    await measure("RETURNING", returning_create, returning_update, returning_delete)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,77 @@
+"""
+/directions-with-disciplines при 50 направлениях × 60 дисциплин:
+ORM (selectinload + словари в Python + orjson) против одного запроса
+с json_build_object/json_agg, который сразу возвращает текст JSON.
+
+Нужна запущенная Postgres с примененными миграциями. Данные вставляются
+в транзакции, которая в конце откатывается.
+
+Запуск: SECRET_KEY=... python -m benchmarks.bench_directions_json
+"""
+import asyncio
+import time
+
+import orjson
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.catalog import directions_document_query, load_directions
+from app.database import engine
+from app.models.plan import Direction, Discipline
+
+DIRECTIONS = 50
+DISCIPLINES_PER_DIRECTION = 60
+REPEAT = 30
+
+
+async def timed(label, fn):
+    timings = []
+    size = 0
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        size = len(await fn())
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    print(f"{label:>10}: медиана {timings[len(timings) // 2] * 1000:7.2f} мс, {size} байт")
+
+
+async def main() -> None:
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        try:
+            direction_ids = (await conn.execute(
+                insert(Direction).returning(Direction.id, sort_by_parameter_order=True),
+                [{"name": f"bench-direction-{i}"} for i in range(DIRECTIONS)],
+            )).scalars().all()
+            await conn.execute(insert(Discipline), [
+                {
+                    "name": f"Дисциплина {j} направления {direction_id}",
+                    "start_term": j % 8 + 1,
+                    "end_term": min(j % 8 + 1 + j % 3, 12),
+                    "group": "Общие" if j % 4 == 0 else f"Профиль {j % 4}",
+                    "direction_id": direction_id,
+                }
+                for direction_id in direction_ids
+                for j in range(DISCIPLINES_PER_DIRECTION)
+            ])
+
+            session = AsyncSession(bind=conn, expire_on_commit=False)
+
+            async def orm_path():
+                session.expunge_all()
+                return orjson.dumps(await load_directions(session))
+
+            async def json_agg_path():
+                result = await session.execute(directions_document_query())
+                return result.scalar_one().encode("utf-8")
+
+            await timed("ORM", orm_path)
+            await timed("json_agg", json_agg_path)
+            await session.close()
+        finally:
+            await transaction.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,30 @@
+"""
+Стоимость проверки токена в get_current_user (зависимость всех /admin/cms/*):
+полная jose.jwt.decode с проверкой подписи против кэша проверенных токенов.
+
+Запуск: SECRET_KEY=... python -m benchmarks.bench_jwt
+"""
+import timeit
+
+from app.jwt_manager import jwt_manager
+
+
+def main() -> None:
+    token = jwt_manager.create_access_token({"sub": "1", "email": "editor@example.com"})
+    number = 5000
+
+    def uncached():
+        payload = jwt_manager.verify_token(token)
+        return int(payload["sub"])
+
+    def cached():
+        return jwt_manager.get_user_id_from_token(token)
+
+    for label, fn in (("jwt.decode", uncached), ("кэш проверенных", cached)):
+        best = min(timeit.repeat(fn, number=number, repeat=5)) / number
+        print(f"{label:>16}: {best * 1e6:8.2f} µs/запрос")
+    print(f"{'':>16}  {jwt_manager.verified_tokens.stats()}")
+
+
+if __name__ == "__main__":
+    main()
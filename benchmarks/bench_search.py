@@ -0,0 +1,81 @@
+"""
+Время /api/search на 100k строк: по 25k дисциплин, преподавателей,
+предметов и достижений, поиск через хранимые колонки search_vector с GIN-индексами (миграция d8a3b6f0c4e1).
+
+Нужна запущенная Postgres с примененными миграциями. Все строки вставляются
+в одной транзакции, которая в конце откатывается, — в базе ничего не остается.
+
+Запуск: SECRET_KEY=... python -m benchmarks.bench_search
+"""
+import asyncio
+import random
+import time
+
+from sqlalchemy import insert, text
+
+from app.database import engine
+from app.models.plan import Direction, Discipline
+from app.models.teacher import Teacher
+from app.models.subject import Subject
+from app.models.achievement import Achievement
+from app.search import build_search_query
+
+ROWS_PER_TABLE = 25_000
+WORDS = (
+    "математика программирование алгоритмы данные сети безопасность физика анализ "
+    "проектирование системы базы интеллект обучение машинное разработка веб мобильная "
+    "олимпиада хакатон победа конференция доцент профессор кафедра информатика"
+).split()
+QUERIES = ("программирование", "машинное обучение", "базы данных", "олимпиада -хакатон", "доцент кафедры")
+
+
+def phrase(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+async def main() -> None:
+    rng = random.Random(1)
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        try:
+            direction_id = (await conn.execute(
+                insert(Direction).values(name="bench-search").returning(Direction.id)
+            )).scalar_one()
+            await conn.execute(insert(Discipline), [
+                {"name": f"{phrase(rng, 3)} {i}", "start_term": 1, "end_term": 2, "group": "Общие", "direction_id": direction_id}
+                for i in range(ROWS_PER_TABLE)
+            ])
+            await conn.execute(insert(Teacher), [
+                {"fio": f"bench {i} {phrase(rng, 2)}", "post": phrase(rng, 3), "image_url": "", "subjects": []}
+                for i in range(ROWS_PER_TABLE)
+            ])
+            await conn.execute(insert(Subject), [
+                {"name": f"bench {i} {phrase(rng, 2)}", "description": phrase(rng, 12)}
+                for i in range(ROWS_PER_TABLE)
+            ])
+            await conn.execute(insert(Achievement), [
+                {"theme": rng.choice(WORDS), "title": f"bench {i} {phrase(rng, 4)}", "description": phrase(rng, 20)}
+                for i in range(ROWS_PER_TABLE)
+            ])
+            await conn.execute(text("ANALYZE disciplines, teachers, subjects, achievements"))
+
+            query = build_search_query(20)
+            for q in QUERIES:
+                timings = []
+                for _ in range(20):
+                    started = time.perf_counter()
+                    rows = (await conn.execute(query, {"q": q})).all()
+                    timings.append(time.perf_counter() - started)
+                timings.sort()
+                print(f"{q!r:>24}: {len(rows):2d} результатов, медиана {timings[len(timings) // 2] * 1000:6.2f} мс")
+
+            sql = query.params(q=QUERIES[0]).compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True})
+            plan = await conn.exec_driver_sql(f"EXPLAIN ANALYZE {sql}")
+            print("\n".join(row[0] for row in plan))
+        finally:
+            await transaction.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
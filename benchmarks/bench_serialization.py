@@ -0,0 +1,61 @@
+"""
+Сравнение стоимости ответа списка преподавателей на один запрос:
+старый путь (валидация ORM-строк через Pydantic + json.dumps) против
+готовых байтов из снимка кэша.
+
+Запуск: SECRET_KEY=... python -m benchmarks.bench_serialization [rows]
+"""
+import json
+import sys
+import timeit
+from typing import List
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from app.cache import Snapshot
+from app.models.teacher import Teacher
+from app.schemas.teacher import Teacher as TeacherSchema
+
+
+def make_rows(count: int) -> list:
+    return [
+        Teacher(
+            id=i + 1,
+            fio=f"Преподаватель {i:04d} Иванович",
+            post="Доцент кафедры информатики и программного обеспечения",
+            subjects=["Python", "Базы данных", "Алгоритмы и структуры данных"],
+            image_url=f"/media/{i:032x}.jpg",
+        )
+        for i in range(count)
+    ]
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    rows = make_rows(count)
+    adapter = TypeAdapter(List[TeacherSchema])
+
+    def pydantic_path():
+        # То, что FastAPI делает с response_model на каждый запрос
+        validated = adapter.validate_python(rows, from_attributes=True)
+        content = adapter.dump_python(validated, mode="json")
+        return Response(json.dumps(content, ensure_ascii=False).encode("utf-8"), media_type="application/json")
+
+    snapshot = Snapshot("teachers", 0, tuple(TeacherSchema.model_validate(r).model_dump() for r in rows))
+    snapshot.body
+
+    def snapshot_path():
+        return Response(content=snapshot.body, media_type="application/json")
+
+    for label, fn in (("pydantic + json", pydantic_path), ("pre-serialized", snapshot_path)):
+        number = 200
+        best = min(timeit.repeat(fn, number=number, repeat=5)) / number
+        print(f"{label:>16}: {best * 1e6:10.1f} µs/запрос ({count} строк)")
+
+    rebuild = min(timeit.repeat(lambda: Snapshot("t", 0, snapshot.data).body, number=200, repeat=5)) / 200
+    print(f"{'orjson rebuild':>16}: {rebuild * 1e6:10.1f} µs (один раз на ревизию)")
+
+
+if __name__ == "__main__":
+    main()
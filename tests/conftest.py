@@ -0,0 +1,4 @@
+import os
+
+# app.jwt_manager отказывается стартовать без ключа
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
@@ -0,0 +1,31 @@
+import asyncio
+import time
+
+import pytest
+
+from app.security import PasswordHasher, PasswordServiceBusy
+
+
+def _slow(value):
+    time.sleep(0.2)
+    return value
+
+
+def test_cancelled_call_keeps_slot_until_job_finishes():
+    async def scenario():
+        hasher = PasswordHasher(workers=1, max_pending=0)
+        task = asyncio.create_task(hasher._run(_slow, 1))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        await asyncio.sleep(0.01)
+        # bcrypt в потоке еще идет — новый вызов сверх лимита отклоняется
+        assert hasher.in_flight == 1
+        with pytest.raises(PasswordServiceBusy):
+            await hasher._run(_slow, 2)
+        await asyncio.sleep(0.3)
+        assert hasher.in_flight == 0
+        assert await hasher._run(_slow, 3) == 3
+        return hasher.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["completed"] == 2 and stats["rejected"] == 1
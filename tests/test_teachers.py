@@ -0,0 +1,68 @@
+"""
+/teachers?subject=: фильтр по предмету (subjects @> ARRAY[...]).
+
+Проверка запроса не требует БД; сквозная — нужна Postgres с примененными
+миграциями (DB_* как у приложения), иначе пропускается.
+"""
+import asyncio
+import uuid
+
+import httpx
+import pytest
+from sqlalchemy import delete, insert, select, text
+from sqlalchemy.dialects import postgresql
+
+from app.database import AsyncSessionLocal, engine
+from app.main import app
+from app.models.subject import Subject
+from app.models.teacher import Teacher
+
+
+def test_subject_filter_compiles_to_array_contains():
+    query = select(Teacher.id).where(Teacher.subjects.contains(["Python"]))
+    sql = str(query.compile(dialect=postgresql.dialect()))
+    assert "teachers.subjects @>" in sql
+
+
+async def _database_available() -> bool:
+    try:
+        async with engine.connect() as conn:
+            await asyncio.wait_for(conn.execute(text("SELECT 1")), timeout=2)
+        return True
+    except Exception:
+        return False
+    finally:
+        await engine.dispose()
+
+
+async def _filter_scenario():
+    tag = uuid.uuid4().hex[:8]
+    subject_name = f"Subject {tag}"
+    async with AsyncSessionLocal() as session:
+        await session.execute(insert(Subject).values(name=subject_name, description="test"))
+        await session.execute(insert(Teacher), [
+            {"fio": f"Teacher A {tag}", "post": "test", "image_url": "", "subjects": [subject_name]},
+            {"fio": f"Teacher B {tag}", "post": "test", "image_url": "", "subjects": ["Other"]},
+        ])
+        await session.commit()
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            # Регистр и пробелы по краям не важны — как у /subjects/{id}/teachers
+            response = await client.get("/teachers", params={"subject": f"  {subject_name.lower()} "})
+        return response
+    finally:
+        async with AsyncSessionLocal() as session:
+            await session.execute(delete(Teacher).where(Teacher.fio.like(f"Teacher % {tag}")))
+            await session.execute(delete(Subject).where(Subject.name == subject_name))
+            await session.commit()
+        await engine.dispose()
+
+
+def test_teachers_filtered_by_subject():
+    if not asyncio.run(_database_available()):
+        pytest.skip("Postgres недоступна")
+    response = asyncio.run(_filter_scenario())
+    assert response.status_code == 200
+    fios = [teacher["fio"] for teacher in response.json()["items"]]
+    assert len(fios) == 1 and fios[0].startswith("Teacher A ")